@@ -0,0 +1,170 @@
+"""
+End-to-end benchmark of ccli's judge flows against benchmarks/mock_judge.py.
+
+Starts the mock judge, then has --clients concurrent users each log in to every judge and run
+its flows (submit and wait for the verdict, list submissions, stats, statements, udebug) for
+--rounds rounds, reporting latency percentiles per flow and the overall throughput. The flows named
+"view ..." go through CLI.parse, as `ccli view solutions <judge>` would, rendering included.
+
+    python benchmarks/end_to_end.py [--clients 8] [--rounds 3] [--latency 0.05] [--judge-time 1] [judge ...]
+"""
+import argparse
+import contextlib
+import functools
+import io
+import os
+import pathlib
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = pathlib.Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT.parent / "competitive-cli"))
+
+import mock_judge  # noqa: E402
+
+JUDGES = ["codeforces", "uva", "codechef", "udebug"]
+
+
+def free_port():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+@contextlib.contextmanager
+def mock_server(port, latency, judge_time):
+    """
+    Runs mock_judge.py in its own process for the duration of the block.
+    """
+    server = subprocess.Popen([sys.executable, str(ROOT / "mock_judge.py"), "--port={}".format(port),
+                               "--latency={}".format(latency), "--judge_time={}".format(judge_time),
+                               "--logging=none"],
+                              stdout=subprocess.PIPE, universal_newlines=True)
+    try:
+        server.stdout.readline()  # the first base URL is printed once the server listens
+        yield
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def flows(SessionAPI, CLI, judge, client, solution, poll_delay):
+    """
+    :return: [(flow name, callable)] run in order by one client for one round; the first logs in
+             and makes the session the one the client's CLI commands use
+    """
+    user = "user{}".format(client)
+    if judge == "udebug":
+        counter = iter(range(10 ** 9))
+        return [("udebug.accepted_output",
+                 lambda: SessionAPI.udebug.accepted_output("100", "uva", "{} {}\n".format(client, next(counter))))]
+
+    session = SessionAPI.SessionAPI.factoryMethod(judge)
+    session.poller = functools.partial(SessionAPI.VerdictPoller, initial_delay=poll_delay, factor=1.3)
+    problem = {"codeforces": "1512A", "uva": "100", "codechef": "ADDNUM"}[judge]
+    submit = {
+        "codeforces": lambda: session.submit(problem, solution),
+        "uva": lambda: session.submit(problem, solution, "c++"),
+        "codechef": lambda: session.submit(problem, solution, "cpp"),
+    }[judge]
+    user_stats = {
+        "codeforces": ("view stats", lambda: CLI.parse(["view", "stats", judge])),
+        "uva": ("view stats", lambda: CLI.parse(["view", "stats", judge])),
+        # `view stats` does not know the CodeChef username user_stats needs
+        "codechef": ("user_stats", lambda: session.user_stats(user)),
+    }[judge]
+
+    def login():
+        session.login(user, "password")
+        CLI.set_session(session)
+
+    return [
+        (judge + ".login", login),
+        (judge + ".submit", submit),
+        (judge + ".view solutions", lambda: CLI.parse(["view", "solutions", judge])),
+        (judge + "." + user_stats[0], user_stats[1]),
+        (judge + ".statement", lambda: session.statements.get(session, problem, revalidate=True)),
+    ]
+
+
+def run_client(SessionAPI, CLI, judges, client, rounds, solution, poll_delay):
+    """
+    Runs in a context of its own (see context.isolated), so the client's CLI session is its own.
+    :return: {flow name: [seconds per call]}
+    """
+    timings = dict()
+    for judge in judges:
+        judge_flows = flows(SessionAPI, CLI, judge, client, solution, poll_delay)
+        for attempt in range(rounds):
+            for name, flow in judge_flows:
+                if attempt and name.endswith(".login"):
+                    continue
+                start = time.perf_counter()
+                flow()
+                timings.setdefault(name, []).append(time.perf_counter() - start)
+    return timings
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds the mock judge adds per response")
+    parser.add_argument("--judge-time", type=float, default=1.0, help="seconds until a verdict is final")
+    parser.add_argument("--poll-delay", type=float, default=0.2, help="first delay between verdict checks")
+    parser.add_argument("judge", nargs="*", help="only run these judges: " + ", ".join(JUDGES))
+    args = parser.parse_args()
+    judges = args.judge or JUDGES
+
+    port = free_port()
+    home = tempfile.mkdtemp(prefix="ccli_e2e_")
+    # caches and base URLs are read when SessionAPI is imported, so both are set up first
+    os.environ["HOME"] = home
+    os.environ.update(mock_judge.environment(port))
+    import SessionAPI
+    import CLI
+    import context
+
+    CLI.load_manager()
+
+    solution = pathlib.Path(home) / "solution.cpp"
+    solution.write_text("int main() { return 0; }\n")
+
+    with mock_server(port, args.latency, args.judge_time):
+        start = time.perf_counter()
+        # the scrapers print progress; keep it out of the report
+        with contextlib.redirect_stdout(io.StringIO()), ThreadPoolExecutor(max_workers=args.clients) as pool:
+            results = list(pool.map(lambda client: context.isolated(run_client, SessionAPI, CLI, judges, client,
+                                                                    args.rounds, solution, args.poll_delay),
+                                    range(args.clients)))
+        elapsed = time.perf_counter() - start
+
+    timings = dict()
+    for result in results:
+        for name, values in result.items():
+            timings.setdefault(name, []).extend(values)
+
+    print("{} clients x {} rounds, {:.0f} ms latency, {:.1f} s judge time".format(
+        args.clients, args.rounds, args.latency * 1000, args.judge_time))
+    print("{:<28} {:>6} {:>10} {:>10} {:>10}".format("flow", "calls", "p50", "p95", "max"))
+    for name, values in timings.items():
+        print("{:<28} {:>6} {:>7.1f} ms {:>7.1f} ms {:>7.1f} ms".format(
+            name, len(values), statistics.median(values) * 1000, percentile(values, 0.95) * 1000,
+            max(values) * 1000))
+    calls = sum(len(values) for values in timings.values())
+    print("{} calls in {:.1f} s, {:.1f} flows/sec".format(calls, elapsed, calls / elapsed))
+
+
+if __name__ == "__main__":
+    main()
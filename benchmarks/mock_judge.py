@@ -0,0 +1,449 @@
+"""
+Local stand-in for the judges, for end-to-end benchmarks and load tests without network access.
+
+Serves the synthetic pages under benchmarks/fixtures for UVa, uHunt, CodeChef, Codeforces and
+udebug, and the collector `view stats` reports to, adding --latency seconds to every response.
+Logins always succeed (CodeChef users named limit... go through its session limit page first), and
+each submission goes through its judge's verdict progression (queued, running, accepted) over
+--judge_time seconds.
+
+    python benchmarks/mock_judge.py [--port=8900] [--latency=0.05] [--judge_time=2]
+
+ccli talks to it once the base URLs it prints on startup are exported, e.g.
+CCLI_CODEFORCES_URL=http://127.0.0.1:8900/codeforces/
+"""
+import asyncio
+import itertools
+import json
+import random
+import time
+import zlib
+
+import tornado.escape
+import tornado.ioloop
+import tornado.web
+from tornado.options import define, options
+
+from pages import fixture
+
+define("port", default=8900, help="runs on the given port", type=int)
+define("latency", default=0.05, help="seconds added to every response", type=float)
+define("jitter", default=0.2, help="random extra latency, as a fraction of --latency", type=float)
+define("judge_time", default=2.0, help="seconds from a submission to its final verdict", type=float)
+
+# judge -> suffix of its base URL, so that base URL + path matches what the real site serves
+JUDGES = {
+    'uva': '/uva/',
+    'uhunt': '/uhunt/',
+    'codechef': '/codechef',
+    'codeforces': '/codeforces/',
+    'udebug': '/udebug/',
+    'stats': '/stats/',
+}
+
+
+class Submission:
+    # above the ids in the fixture pages, as a new submission would be
+    ids = itertools.count(300000000)
+
+    def __init__(self, judge, user, problem):
+        self.id = next(Submission.ids)
+        self.judge = judge
+        self.user = user
+        self.problem = problem
+        self.submitted = time.time()
+
+    def stage(self, stages):
+        """
+        :return: the entry of stages the submission has reached, the last one once judge_time has passed
+        """
+        if options.judge_time <= 0:
+            return stages[-1]
+        progress = (time.time() - self.submitted) / options.judge_time
+        return stages[min(len(stages) - 1, int(progress * (len(stages) - 1)))]
+
+
+submissions = []
+
+
+def submissions_of(judge, user):
+    """
+    :return: the user's submissions to the judge, latest first
+    """
+    return [sub for sub in reversed(submissions) if sub.judge == judge and sub.user == user]
+
+
+class MockHandler(tornado.web.RequestHandler):
+    judge = None
+
+    async def prepare(self):
+        if options.latency > 0:
+            await asyncio.sleep(options.latency * (1 + random.uniform(0, options.jitter)))
+
+    def base(self, judge=None):
+        return "{}://{}{}".format(self.request.protocol, self.request.host, JUDGES[judge or self.judge])
+
+    @property
+    def user(self):
+        return self.get_cookie("user", "")
+
+    def login(self, user):
+        self.set_cookie("user", user)
+
+    def write_json(self, data):
+        self.set_header("Content-Type", "application/json")
+        self.write(json.dumps(data))
+
+
+# Codeforces
+
+class CodeforcesHandler(MockHandler):
+    judge = 'codeforces'
+    VERDICTS = ["In queue", "Running on test 1", "Running on test 7", "Accepted"]
+
+    def home(self):
+        self.write('<html><body><a href="/profile/{0}">{0}</a> | <a href="logout">Logout</a></body></html>'
+                   .format(self.user))
+
+
+class CodeforcesHome(CodeforcesHandler):
+    def get(self):
+        self.home()
+
+
+class CodeforcesEnter(CodeforcesHandler):
+    def get(self):
+        self.write(fixture("codeforces/enter.html"))
+
+    def post(self):
+        self.login(self.get_argument("handle"))
+        self.redirect(self.base())
+
+
+class CodeforcesLogout(CodeforcesHandler):
+    def get(self):
+        self.clear_cookie("user")
+        self.redirect(self.base())
+
+
+class CodeforcesSubmit(CodeforcesHandler):
+    def get(self):
+        self.write(fixture("codeforces/submit.html"))
+
+    def post(self):
+        submissions.append(Submission(self.judge, self.user, self.get_argument("submittedProblemCode")))
+        self.redirect(self.base() + "problemset/status")
+
+
+class CodeforcesStatus(CodeforcesHandler):
+    def get(self):
+        self.write("<html><body>Status</body></html>")
+
+
+class CodeforcesSubmissions(CodeforcesHandler):
+    ROW = ('<tr data-submission-id="{0}"><td>{0}</td><td>now</td><td>{1}</td><td>{2}</td><td>GNU C++17</td>'
+           '<td><span class="submissionVerdictWrapper">{3}</span></td><td>15 ms</td><td>0 KB</td></tr>')
+
+    def get(self, user):
+        page = fixture("codeforces/submissions.html")
+        header_end = page.index("</tr>", page.index('class="first-row"')) + len("</tr>")
+        rows = "".join(CodeforcesSubmissions.ROW.format(sub.id, user, sub.problem, sub.stage(self.VERDICTS))
+                       for sub in submissions_of(self.judge, user))
+        self.write(page[:header_end] + rows + page[header_end:])
+
+
+class CodeforcesProblem(CodeforcesHandler):
+    def get(self, contest_id, index):
+        self.write(fixture("codeforces/problem.html"))
+
+
+class CodeforcesProfile(CodeforcesHandler):
+    def get(self, user):
+        self.write(fixture("codeforces/profile.html"))
+
+
+class CodeforcesStandings(CodeforcesHandler):
+    def get(self):
+        contest_id = int(self.get_argument("contestId"))
+        self.write_json({'status': 'OK', 'result': {
+            'problems': [{'contestId': contest_id, 'index': index} for index in "ABCDEF"]}})
+
+
+# UVa and uHunt
+
+def uhunt_uid(user):
+    return str(zlib.crc32(user.encode()) % 1000000 + 1)
+
+
+class UvaHandler(MockHandler):
+    judge = 'uva'
+    # uHunt verdict ids: 0 while pending, 90 for accepted
+    VERDICTS = [0, 0, 90]
+
+    def row(self, sub):
+        return [sub.id, int(sub.problem) - 64, sub.stage(self.VERDICTS), 10, int(sub.submitted), 5, -1]
+
+
+class UvaHome(UvaHandler):
+    def get(self):
+        self.write(fixture("uva/home.html"))
+
+
+class UvaIndex(UvaHandler):
+    def get(self):
+        option, item = self.get_argument("option", ""), self.get_argument("Itemid", "")
+        if self.get_argument("page", "") == "show_problem":
+            self.write(fixture("uva/problem.html"))
+        elif option == "com_onlinejudge" and item == "15":
+            self.write(fixture("uva/statistics.html"))
+        elif option == "com_comprofiler" and item == "3":
+            self.write(fixture("uva/profile.html"))
+        else:
+            self.write("<html><body>{}</body></html>".format(self.get_argument("mosmsg", "")))
+
+    def post(self):
+        if self.get_argument("task", "") == "login":
+            self.login(self.get_argument("username"))
+            self.redirect(self.base())
+        elif self.get_argument("page", "") == "save_submission":
+            sub = Submission(self.judge, self.user, self.get_argument("localid"))
+            submissions.append(sub)
+            self.redirect(self.base() + "index.php?option=com_onlinejudge&Itemid=9"
+                          "&mosmsg=Submission+received+with+ID+{}".format(sub.id))
+        else:
+            raise tornado.web.HTTPError(404)
+
+
+class UvaStatement(UvaHandler):
+    def get(self, path):
+        self.set_header("Content-Type", "application/pdf")
+        self.write(b"%PDF-1.4\n" + fixture("uva/problem.html").encode())
+
+
+class UhuntUid(UvaHandler):
+    def get(self, user):
+        self.write(uhunt_uid(user))
+
+
+class UhuntProblems(UvaHandler):
+    def get(self):
+        self.write_json([[num - 64, num, "Problem {}".format(num)] for num in range(100, 1200)])
+
+
+class UhuntProblem(UvaHandler):
+    def get(self, key, value):
+        num = int(value) if key == "num" else int(value) + 64
+        self.write_json({'pid': num - 64, 'num': num})
+
+
+class UhuntSince(UvaHandler):
+    def get(self, uid, min_id):
+        subs = [self.row(sub) for sub in submissions
+                if sub.judge == self.judge and uhunt_uid(sub.user) == uid and sub.id > int(min_id)]
+        self.write_json({'name': uid, 'uname': uid, 'subs': subs})
+
+
+class UhuntLast(UvaHandler):
+    def get(self, uid, count):
+        recorded = json.loads(fixture("uhunt/subs-user.json"))
+        subs = recorded['subs'] + [self.row(sub) for sub in submissions
+                                   if sub.judge == self.judge and uhunt_uid(sub.user) == uid]
+        recorded['subs'] = subs[-int(count):]
+        self.write_json(recorded)
+
+
+class UhuntByProblem(UvaHandler):
+    def get(self, uid, pid):
+        subs = [self.row(sub) for sub in submissions if sub.judge == self.judge and
+                uhunt_uid(sub.user) == uid and int(sub.problem) - 64 == int(pid)]
+        self.write_json({uid: {'name': uid, 'uname': uid, 'subs': subs}})
+
+
+# CodeChef
+
+class CodechefHandler(MockHandler):
+    judge = 'codechef'
+    FORM = ('<form method="post"><input type="hidden" name="form_build_id" value="form-mock"/>'
+            '<input type="hidden" name="form_id" value="{}"/></form>')
+
+
+class CodechefHome(CodechefHandler):
+    def get(self):
+        user = '<span class="user">{}</span>'.format(tornado.escape.xhtml_escape(self.user))
+        self.write(fixture("codechef/home.html").replace('<span class="user"></span>', user))
+
+    def post(self):
+        # users named limit... have too many sessions open, as CodeChef's session limit page reports
+        if self.get_argument("name").startswith("limit"):
+            self.set_cookie("pending", self.get_argument("name"))
+            self.redirect(self.base() + "/session/limit")
+            return
+        self.login(self.get_argument("name"))
+        self.redirect(self.base())
+
+
+class CodechefSessionLimit(CodechefHandler):
+    def get(self):
+        self.write(fixture("codechef/session_limit.html"))
+
+    def post(self):
+        self.login(self.get_cookie("pending", ""))
+        self.clear_cookie("pending")
+        self.redirect(self.base())
+
+
+class CodechefLogout(CodechefHandler):
+    def get(self):
+        self.clear_cookie("user")
+        self.redirect(self.base())
+
+
+class CodechefContests(CodechefHandler):
+    def get(self):
+        self.write(fixture("codechef/contests.html"))
+
+
+class CodechefContest(CodechefHandler):
+    def get(self, contest):
+        self.write_json({'status': 'success', 'problems': {
+            contest + index: {'code': contest + index} for index in "ABC"}})
+
+
+class CodechefProblem(CodechefHandler):
+    def get(self, contest, problem):
+        self.write(fixture("codechef/problem.json"))
+
+
+class CodechefStatement(CodechefHandler):
+    def get(self, contest, problem):
+        self.write("<html><body><h1>{}</h1>{}</body></html>".format(
+            problem, json.loads(fixture("codechef/problem.json"))['body']))
+
+
+class CodechefSubmit(CodechefHandler):
+    def get(self, contest, problem):
+        self.write("<html><body>{}</body></html>".format(CodechefHandler.FORM.format("problem_submission")))
+
+    def post(self, contest, problem):
+        sub = Submission(self.judge, self.user, problem)
+        submissions.append(sub)
+        self.redirect(self.base() + "/submit/complete/{}".format(sub.id))
+
+
+class CodechefComplete(CodechefHandler):
+    def get(self, submission_id):
+        self.write("<html><body>Submitted</body></html>")
+
+
+class CodechefSolution(CodechefHandler):
+    STAGES = ["compiling..", "running..", "done"]
+
+    def get(self, submission_id):
+        sub = next((sub for sub in submissions if sub.id == int(submission_id)), None)
+        stage = "done" if sub is None else sub.stage(CodechefSolution.STAGES)
+        if stage == "done":
+            self.write(fixture("codechef/viewsolution.html"))
+        else:
+            self.write('<html><body><div id="solutiondiv">{}</div></body></html>'.format(stage))
+
+
+class CodechefSubmissions(CodechefHandler):
+    def get(self):
+        self.write(fixture("codechef/submissions.html"))
+
+
+class CodechefUser(CodechefHandler):
+    def get(self, user):
+        self.write(fixture("codechef/user.html"))
+
+
+class CodechefStatus(CodechefHandler):
+    def get(self, problem):
+        self.write(fixture("codechef/status.html"))
+
+
+# udebug
+
+class UdebugHandler(MockHandler):
+    judge = 'udebug'
+
+
+class UdebugProblem(UdebugHandler):
+    def get(self, judge, problem):
+        self.write(fixture("udebug/problem.html"))
+
+    def post(self, judge, problem):
+        self.write(fixture("udebug/output.html"))
+
+
+class UdebugInput(UdebugHandler):
+    def post(self):
+        nid = int(self.get_argument("input_nid"))
+        self.write_json({'input_value': "\n".join("{} {}".format(nid % 97 + i, nid % 89 + 2 * i)
+                                                  for i in range(100)) + "\n"})
+
+
+# the collector `ccli view stats` reports to
+
+class StatsCollector(MockHandler):
+    def get(self):
+        self.write("")
+
+
+def make_app():
+    return tornado.web.Application([
+        (r"/codeforces/", CodeforcesHome),
+        (r"/codeforces/enter", CodeforcesEnter),
+        (r"/codeforces/logout", CodeforcesLogout),
+        (r"/codeforces/problemset/submit", CodeforcesSubmit),
+        (r"/codeforces/problemset/status", CodeforcesStatus),
+        (r"/codeforces/problemset/problem/(\d+)/(\w+)", CodeforcesProblem),
+        (r"/codeforces/submissions/([^/]+)", CodeforcesSubmissions),
+        (r"/codeforces/profile/([^/]+)", CodeforcesProfile),
+        (r"/codeforces/api/contest.standings", CodeforcesStandings),
+        (r"/uva/", UvaHome),
+        (r"/uva/index.php", UvaIndex),
+        (r"/uva/external/(.+)", UvaStatement),
+        (r"/uhunt/uname2uid/([^/]+)", UhuntUid),
+        (r"/uhunt/p", UhuntProblems),
+        (r"/uhunt/p/(id|num)/(\d+)", UhuntProblem),
+        (r"/uhunt/subs-user/(\d+)/(\d+)", UhuntSince),
+        (r"/uhunt/subs-user-last/(\d+)/(\d+)", UhuntLast),
+        (r"/uhunt/subs-pids/(\d+)/(\d+)", UhuntByProblem),
+        (r"/codechef/?", CodechefHome),
+        (r"/codechef/logout", CodechefLogout),
+        (r"/codechef/session/limit", CodechefSessionLimit),
+        (r"/codechef/contests", CodechefContests),
+        (r"/codechef/api/contests/(\w+)", CodechefContest),
+        (r"/codechef/api/contests/(\w+)/problems/(\w+)", CodechefProblem),
+        (r"/codechef(/\w+)?/problems/(\w+)", CodechefStatement),
+        (r"/codechef/submit/complete/(\d+)", CodechefComplete),
+        (r"/codechef(/\w+)?/submit/(\w+)", CodechefSubmit),
+        (r"/codechef/viewsolution/(\d+)", CodechefSolution),
+        (r"/codechef/submissions", CodechefSubmissions),
+        (r"/codechef/users/([^/]+)", CodechefUser),
+        (r"/codechef/status/(\w+)", CodechefStatus),
+        (r"/udebug/udebug-custom-get-selected-input-ajax", UdebugInput),
+        (r"/udebug/(\w+)/(\w+)", UdebugProblem),
+        (r"/stats/", StatsCollector),
+    ])
+
+
+def environment(port):
+    """
+    :return: the CCLI_<JUDGE>_URL variables pointing ccli at a mock judge on the port
+    """
+    return {"CCLI_{}_URL".format(judge.upper()): "http://127.0.0.1:{}{}".format(port, suffix)
+            for judge, suffix in JUDGES.items()}
+
+
+def main():
+    tornado.options.parse_command_line()
+    make_app().listen(options.port, address="127.0.0.1")
+    for name, value in environment(options.port).items():
+        print("export {}={}".format(name, value), flush=True)
+    tornado.ioloop.IOLoop.current().start()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Loads the synthetic judge pages under benchmarks/fixtures, for parsing.py and mock_judge.py.
+
+The committed pages hold only what the scrapers read. A real judge page wraps that in a lot more
+markup (style rules, scripts, navigation and footer links), so fixture() generates such filler
+around every HTML page as it is loaded, and parsing a fixture walks a page of about the real size.
+Large generated bodies are written as {{name}} in a page and filled in from GENERATED.
+"""
+import functools
+import pathlib
+import random
+
+FIXTURES = pathlib.Path(__file__).resolve().parent / "fixtures"
+
+
+def accepted_output():
+    """
+    :return: udebug's accepted output for a large input, 5000 lines
+    """
+    numbers = random.Random(100)
+    return "\n".join("{} {} {}".format(i, i + 1000, numbers.randint(1, 300)) for i in range(5000))
+
+
+GENERATED = {
+    'accepted_output': accepted_output,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def chrome(site):
+    """
+    :return: filler markup for the end of <head>, the start of <body> and the end of <body>
+    """
+    styles = "\n".join(".rule-{0} {{ margin: {0}px; padding: 2px; color: #{0:06x}; }}".format(i)
+                       for i in range(200))
+    script = "\n".join("var config{0} = {{key: 'value{0}', list: [{1}]}};".format(
+        i, ",".join(str(j) for j in range(20))) for i in range(150))
+    nav = "\n".join('<li class="menu-item"><a href="/{0}/{1}">Menu {1}</a></li>'.format(site, i)
+                    for i in range(120))
+    footer = "\n".join('<div class="footer-link"><a href="/page/{0}">Footer link {0}</a></div>'.format(i)
+                       for i in range(60))
+    return ('<style>\n{}\n</style>\n<script type="text/javascript">\n{}\n</script>\n'.format(styles, script),
+            '<div id="header"><ul class="menu">\n{}\n</ul></div>\n'.format(nav),
+            '<div id="footer">\n{}\n</div>\n'.format(footer))
+
+
+@functools.lru_cache(maxsize=None)
+def fixture(name):
+    """
+    :param name: path of the page under benchmarks/fixtures, e.g. "codeforces/enter.html"
+    :return: the page, with its filler and generated bodies filled in
+    """
+    page = (FIXTURES / name).read_text(encoding="utf-8")
+    for key, generate in GENERATED.items():
+        if "{{" + key + "}}" in page:
+            page = page.replace("{{" + key + "}}", generate())
+
+    if name.endswith(".html"):
+        head, header, footer = chrome(name.split("/")[0])
+        page = page.replace("</head>", head + "</head>", 1).replace("<body>\n", "<body>\n" + header, 1)
+        end = page.rindex("</body>")
+        page = page[:end] + footer + page[end:]
+    return page
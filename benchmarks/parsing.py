@@ -0,0 +1,122 @@
+"""
+Measures how long the scrapers spend parsing, without touching the network.
+
+Runs the parse step of each scraper on the pages under benchmarks/fixtures, reporting
+operations per second, mean time per call and the peak Python memory allocated by one call.
+tracemalloc only sees Python allocations, so libxml2's own buffers are not included.
+
+The fixtures are synthetic, not captured from the judges (see benchmarks/fixtures/README.md), so
+the numbers compare versions of the parsing code on the same input. They do not say how fast
+parsing the live pages is.
+
+    python benchmarks/parsing.py [--min-time SECONDS] [case prefix ...]
+"""
+import argparse
+import json
+import pathlib
+import sys
+import time
+import tracemalloc
+
+ROOT = pathlib.Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT.parent / "competitive-cli"))
+
+import run_cpp  # noqa: E402
+from pages import fixture  # noqa: E402
+from SessionAPI import CodeForce, CodechefSession, Parser, UvaSession, udebug  # noqa: E402
+
+
+def cases():
+    """
+    :return: {case name: function running that scraper's parse step on its fixture}, in report order
+    """
+    cf_enter = fixture("codeforces/enter.html")
+    cf_submit = fixture("codeforces/submit.html")
+    cf_submissions = fixture("codeforces/submissions.html")
+    cf_problem = fixture("codeforces/problem.html")
+    cf_profile = fixture("codeforces/profile.html")
+    uva_home = fixture("uva/home.html")
+    uva_statistics = fixture("uva/statistics.html")
+    uva_profile = fixture("uva/profile.html")
+    uva_problem = fixture("uva/problem.html")
+    uhunt_subs = fixture("uhunt/subs-user.json")
+    cc_home = fixture("codechef/home.html")
+    cc_session_limit = fixture("codechef/session_limit.html")
+    cc_status = fixture("codechef/status.html")
+    cc_solution = fixture("codechef/viewsolution.html")
+    cc_contests = fixture("codechef/contests.html")
+    cc_submissions = fixture("codechef/submissions.html")
+    cc_user = fixture("codechef/user.html")
+    cc_problem = fixture("codechef/problem.json")
+    udebug_problem = fixture("udebug/problem.html")
+    udebug_output = fixture("udebug/output.html")
+
+    return {
+        # the whole-tree parse every section() case is measured against
+        "baseline.page": lambda: Parser.page(cf_submissions),
+        "codeforces.login": lambda: Parser.select(
+            Parser.section(cf_enter, 'form#linkEnterForm', hint='linkEnterForm'), 'input'),
+        "codeforces.submit": lambda: Parser.select(
+            Parser.section(cf_submit, 'form.submit-form', hint='submit-form'), 'input'),
+        "codeforces.check_result": lambda: CodeForce.parse_submissions(cf_submissions)[0],
+        "codeforces.display_sub": lambda: CodeForce.parse_submissions(cf_submissions),
+        "codeforces.fetch_samples": lambda: CodeForce.parse_samples(cf_problem),
+        "codeforces.user_stats": lambda: CodeForce.parse_profile(cf_profile),
+        "uva.login": lambda: Parser.select(Parser.page(uva_home), 'form input[type="hidden"]'),
+        "uva.user_stats": lambda: UvaSession.parse_user_stats(uva_statistics, uva_profile),
+        "uva.get_question": lambda: Parser.select(Parser.section(uva_problem, 'td[align="right"]'), 'a')[-1],
+        "uva.check_result": lambda: json.loads(uhunt_subs)['subs'],
+        "codechef.login": lambda: Parser.select(Parser.page(cc_home), 'form input[type="hidden"]'),
+        "codechef.session_limit": lambda: Parser.select(Parser.page(cc_session_limit), 'form input'),
+        "codechef.check_result": lambda: CodechefSession.parse_result(cc_solution),
+        "codechef.info_present_contests": lambda: CodechefSession.data_rows(cc_contests),
+        "codechef.display_sub": lambda: CodechefSession.data_rows(cc_submissions),
+        "codechef.user_stats": lambda: CodechefSession.parse_user_stats(cc_user, "someuser"),
+        "codechef.fetch_samples": lambda: CodechefSession.parse_samples(json.loads(cc_problem)['body']),
+        "udebug.input_ids": lambda: udebug.input_ids(Parser.page(udebug_problem)),
+        "udebug.fetch_output": lambda: Parser.text(
+            Parser.section(udebug_output, 'textarea#edit-output-data', hint='edit-output-data')),
+        "run_cpp.scrape_solution": lambda: (run_cpp.parse_first_submission(cc_status),
+                                            run_cpp.parse_solution(cc_solution)),
+    }
+
+
+def measure(function, min_time):
+    """
+    :return: calls per second, peak bytes of Python memory allocated by one call
+    """
+    function()  # compiles and caches the selectors outside the timed loop
+
+    iterations = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < min_time:
+        function()
+        iterations += 1
+        elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    try:
+        function()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return iterations / elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--min-time", type=float, default=0.5, help="seconds to run each case for")
+    parser.add_argument("case", nargs="*", help="only run cases whose name starts with one of these")
+    args = parser.parse_args()
+
+    print("{:<34} {:>10} {:>12} {:>12}".format("case", "ops/sec", "mean", "peak alloc"))
+    for name, function in cases().items():
+        if args.case and not any(name.startswith(prefix) for prefix in args.case):
+            continue
+        rate, peak = measure(function, args.min_time)
+        print("{:<34} {:>10.1f} {:>9.1f} us {:>9.1f} KiB".format(name, rate, 1e6 / rate, peak / 1024))
+
+
+if __name__ == "__main__":
+    main()
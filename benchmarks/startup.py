@@ -0,0 +1,70 @@
+"""
+Measures ccli cold start.
+
+Runs the CLI in fresh interpreters with `python -X importtime`, reporting the median wall time
+per command and the modules with the largest cumulative import time.
+
+    python benchmarks/startup.py [--runs N] [--top N] [command ...]
+"""
+import argparse
+import os
+import pathlib
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+CLI = pathlib.Path(__file__).resolve().parent.parent / "competitive-cli" / "CLI.py"
+COMMANDS = [["--help"], ["view", "config"], ["view", "tpl"]]
+
+
+def run(command, home):
+    """
+    :return: wall time in seconds, {module: cumulative import time in microseconds}
+    """
+    env = dict(os.environ, HOME=home)
+    start = time.perf_counter()
+    process = subprocess.run([sys.executable, "-X", "importtime", str(CLI)] + command, env=env,
+                             stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, universal_newlines=True)
+    elapsed = time.perf_counter() - start
+
+    imports = dict()
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        try:
+            self_time, cumulative, module = line[len("import time:"):].split("|")
+            imports[module[1:].rstrip()] = int(cumulative)
+        except ValueError:
+            continue
+    return elapsed, imports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("command", nargs="*")
+    args = parser.parse_args()
+    commands = [args.command] if args.command else COMMANDS
+
+    for command in commands:
+        timings, imports = [], dict()
+        for attempt in range(args.runs + 1):
+            # a fresh home per run, so every run starts without config or caches
+            with tempfile.TemporaryDirectory() as home:
+                elapsed, imports = run(command, home)
+            if attempt:  # the first run only warms the OS file cache
+                timings.append(elapsed)
+
+        print("ccli {}: median {:.1f} ms, min {:.1f} ms over {} runs".format(
+            " ".join(command), statistics.median(timings) * 1000, min(timings) * 1000, args.runs))
+        top_level = {module: cumulative for module, cumulative in imports.items()
+                     if not module.startswith(" ")}
+        for module, cumulative in sorted(top_level.items(), key=lambda item: -item[1])[:args.top]:
+            print("    {:>8.1f} ms  {}".format(cumulative / 1000, module))
+
+
+if __name__ == "__main__":
+    main()
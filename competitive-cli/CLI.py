@@ -1,94 +1,446 @@
+import contextlib
+import contextvars
 import getpass
+import io
 import os
 import pathlib
-import pickle
-import prettytable
-import requests
+import shutil
 import sys
 import webbrowser
 
-import CLI_helper
-import SessionAPI
+import context
+import tracing
+from lazy import lazy_import
 
-websiteObject = SessionAPI.SessionAPI()
-manager = CLI_helper.PreferenceManager()
+# Loaded on first use so that trivial commands do not pay for requests, lxml or keyring
+prettytable = lazy_import('prettytable')
+CLI_helper = lazy_import('CLI_helper')
+SessionAPI = lazy_import('SessionAPI')
+runner = lazy_import('runner')
+daemon = lazy_import('daemon')
+
+# judge session of the running command; background jobs and daemon requests each have their own
+_session = contextvars.ContextVar('session', default=None)
+manager = None
+
+
+def load_manager():
+    """
+    :return: the PreferenceManager, created on first use
+    """
+    global manager
+    if manager is None:
+        manager = CLI_helper.PreferenceManager()
+    return manager
+
+
+def current_session():
+    """
+    :return: the judge session of the running command, or None
+    """
+    return _session.get()
+
+
+def set_session(website_object):
+    _session.set(website_object)
+    return website_object
+
+
+def logged_in(website=None):
+    """
+    :param website: judge the command needs; the current session's judge if None
+    """
+    websiteObject = current_session()
+    if websiteObject is None or website is not None and websiteObject.website != website:
+        restore_session(website)
+        websiteObject = current_session()
+    return websiteObject is not None and websiteObject.logged_in and \
+        (website is None or websiteObject.website == website)
+
+
+def restore_session(website=None):
+    """
+    Reuses the saved login of an account on the website, if it has one that has not expired.
+    The default account is tried when no website is given, or when it is on the website.
+    """
+    if manager is None:
+        return
+    key = manager.account if website is None else manager.account_for(website)
+    if key is None or str(key) not in manager.data["accounts"]:
+        return
+
+    website, username = manager.data["accounts"][str(key)]
+    state = CLI_helper.SessionStore().load(website, username)
+    if state is None:
+        return
+    restored = SessionAPI.SessionAPI.factoryMethod(website)
+    if restored is not None and restored.restore_state(state):
+        restored.credentials = lambda: manager.get_account(key)[1:]
+        set_session(restored)
+
+
+def save_session():
+    websiteObject = current_session()
+    if websiteObject is not None and websiteObject.logged_in:
+        CLI_helper.SessionStore().save(websiteObject.website, websiteObject.username,
+                                       websiteObject.export_state())
+
+
+class JobOutput:
+    """
+    Stands in for sys.stdout while several commands run at once, in the interactive shell or the
+    daemon, so that what each command prints goes to its own stream: a background job's buffer
+    instead of the prompt, or the daemon client that sent the command.
+    The stream is a context variable, so the threads a command hands work to with context.carry
+    print to it as well.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.target = contextvars.ContextVar('output', default=None)
+
+    def redirect(self, target):
+        """
+        Sends what the current command prints to target
+        """
+        self.target.set(target)
+
+    def current(self):
+        target = self.target.get()
+        return self.stream if target is None else target
+
+    def write(self, text):
+        return self.current().write(text)
+
+    def flush(self):
+        self.current().flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+class Job:
+    def __init__(self, number, query):
+        self.number = number
+        self.command = ' '.join(query)
+        self.output = io.StringIO()
+        self.future = None
+
+    @property
+    def status(self):
+        if not self.future.done():
+            return "Running"
+        if self.future.exception() is not None:
+            return "Failed"
+        return "Done"
+
+    def report(self):
+        """
+        :return: the job's status line followed by everything it printed
+        """
+        lines = ["[{}] {}  {}".format(self.number, self.status, self.command)]
+        output = self.output.getvalue()
+        if output:
+            lines.append(output.rstrip('\n'))
+        if self.status == "Failed":
+            lines.append("Error: {}".format(self.future.exception()))
+        return '\n'.join(lines)
 
 
 class InteractiveShell:
-    def __init__(self):
+    # network-bound commands that run in the background once you are logged in
+    BACKGROUND_COMMANDS = [['submit'], ['download'], ['debug'], ['view', 'solutions'], ['view', 'stats']]
+
+    def __init__(self, workers=4):
         self.active = False
+        self.workers = workers
+        self.jobs = dict()
+        self.pool = None
+        self.output = None
 
     def start(self):
+        from concurrent.futures import ThreadPoolExecutor
+
         self.active = True
+        self.pool = ThreadPoolExecutor(max_workers=self.workers)
+        self.output = JobOutput(sys.stdout)
+        sys.stdout = self.output
 
-        while self.active:
-            query = input("shell>> ")
-            if query == 'q':
-                self.active = False
-                break
-            else:
-                parse(query.split(' '))
+        try:
+            while self.active:
+                query = input("shell>> ")
+                if query == 'q':
+                    self.active = False
+                    break
+                self.run(query.split())
+        finally:
+            sys.stdout = self.output.stream
+            running = [job for job in self.jobs.values() if not job.future.done()]
+            if running:
+                print("Waiting for {} background job(s)".format(len(running)))
+            self.pool.shutdown(wait=True)
 
         return self
 
     def stop(self):
         self.active = False
 
+    def run(self, query):
+        if query == ['jobs']:
+            self.list_jobs()
+        elif len(query) == 2 and query[0] == 'wait':
+            self.wait(query[1])
+        elif query and query[-1] == '&':
+            self.background(query[:-1])
+        elif self.is_background(query) and logged_in():
+            # commands that may prompt for a login stay in the foreground until you are logged in
+            self.background(query)
+        else:
+            parse(query)
+
+    def is_background(self, query):
+        return any(query[:len(command)] == command for command in InteractiveShell.BACKGROUND_COMMANDS)
+
+    def background(self, query):
+        job = Job(len(self.jobs) + 1, query)
+        print("[{}] {}".format(job.number, job.command))
+        job.future = self.pool.submit(context.carry(self.run_job), job, query)
+        job.future.add_done_callback(lambda future: self.notify(job))
+        self.jobs[job.number] = job
+
+    def run_job(self, job, query):
+        """
+        Runs in a copy of the shell's context, with its own output and its own copy of the shell's
+        judge session, so that jobs running together do not share one
+        """
+        self.output.redirect(job.output)
+        website_object = current_session()
+        if website_object is not None:
+            set_session(website_object.clone())
+        parse(query)
+
+    def notify(self, job):
+        self.output.stream.write("\n{}\n".format(job.report()))
+        self.output.stream.flush()
+
+    def list_jobs(self):
+        if not self.jobs:
+            print("No jobs")
+            return
+        for job in self.jobs.values():
+            print("[{}] {}  {}".format(job.number, job.status, job.command))
+
+    def wait(self, number):
+        """
+        Blocks until the job has finished and shows its output
+        """
+        try:
+            job = self.jobs[int(number)]
+        except (KeyError, ValueError):
+            print("No such job")
+            return
+        try:
+            job.future.result()
+        except Exception:
+            pass
+        print(job.report())
+
+
+def find_solution(probID, path=None):
+    """
+    :return: path of the solution file, looked up as <probID>* in the current directory if not given
+    """
+    if path is not None:
+        return pathlib.Path(path)
+
+    paths = list(pathlib.Path.cwd().glob(probID + '*'))
+    if len(paths)>1:
+        print("Multiple matches")
+        return
+    if len(paths)==0:
+        print("No match found")
+        return
+    return paths[0]
+
 
 def submit(probID, path=None, language=None, website=None):
-    global websiteObject
-    if not websiteObject.logged_in:
+    if not logged_in(website):
         login(website)
+    websiteObject = current_session()
 
+    path = find_solution(probID, path)
     if path is None:
-        paths = list(pathlib.Path.cwd().glob(probID + '*'))
-        if len(paths)>1:
-            print("Multiple matches")
-            return
-        if len(paths)==0:
-            print("No match found")
-            return
-        path = paths[0]
-    else:
-        path = pathlib.Path(path)
+        return
 
     if os.stat(str(path.resolve())).st_size == 0:
         print("File is empty. Please upload a valid file")
         return
 
+    progress = VerdictProgress()
+    websiteObject.on_progress = progress
     if language is None:
         result = websiteObject.submit(probID, path)
     else:
         result = websiteObject.submit(probID, path, language)
+    progress.done()
 
     if result is None or result is False:
         print("Error submitting")
         return
 
-    table = prettytable.PrettyTable(result[0])
-    for row in result[1:]:
-        table.add_row(row)
+    print_table(result)
+
+
+def print_table(rows):
+    """
+    :param rows: header row followed by the data rows
+    """
+    with tracing.span("render table", rows=len(rows) - 1):
+        table = prettytable.PrettyTable(rows[0])
+        for row in rows[1:]:
+            table.add_row(row)
+        print(str(table))
+
+
+class VerdictProgress:
+    """
+    Keeps a single "Waiting for verdict" line updated while a submission is judged
+    """
+
+    def __init__(self):
+        self.shown = False
+
+    def __call__(self, attempt, elapsed, state):
+        print("Waiting for verdict... {:.0f}s (check {})".format(elapsed, attempt), end='\r', flush=True)
+        self.shown = True
+
+    def done(self):
+        """
+        Ends the progress line, so that what is printed next does not overwrite it
+        """
+        if self.shown:
+            print()
+            self.shown = False
+
+
+def judge(website=None):
+    """
+    :return: the current judge session, or a fresh one for the website (no login needed)
+    """
+    websiteObject = current_session()
+    if websiteObject is None:
+        restore_session()
+        websiteObject = current_session()
+    if website is None and websiteObject is not None:
+        return websiteObject
+    if website is None and manager.account is not None:
+        website = manager.get_account(manager.account)[0]
+    elif website is None:
+        website = input("Enter website: ")
+    if websiteObject is None or websiteObject.website != website:
+        websiteObject = set_session(SessionAPI.SessionAPI.factoryMethod(website))
+    return websiteObject
+
+
+def test(probID, path=None, website=None):
+    """
+    Runs your solution against the problem's sample tests in parallel before you submit
+    """
+    path = find_solution(probID, path)
+    if path is None:
+        return
+
+    samples = judge(website).get_samples(probID)
+    if not samples:
+        print("No sample tests found")
+        return
+
+    with runner.Program(path) as program:
+        if not program.compile():
+            return
+        results = runner.run_all(program, [sample[0] for sample in samples], timeout=10)
+
+    table = prettytable.PrettyTable(["Test", "Verdict", "Time(s)", "Expected", "Got"])
+    passed = 0
+    for index, ((sample_input, expected), result) in enumerate(zip(samples, results), 1):
+        if result.timed_out:
+            verdict = "Time limit"
+        elif result.returncode != 0:
+            verdict = "Runtime error"
+        elif SessionAPI.udebug.compare_streams(io.StringIO(result.output), io.StringIO(expected), 'whitespace', 1):
+            verdict = "Wrong answer"
+        else:
+            verdict = "Passed"
+            passed += 1
+        shown = ("", "") if verdict == "Passed" else (expected.strip(), result.output.strip())
+        table.add_row([index, verdict, "{:.3f}".format(result.elapsed)] + list(shown))
+
     print(str(table))
+    print("{}/{} sample tests passed".format(passed, len(samples)))
 
 
-def download(probID, path=pathlib.Path().cwd(), website=None):
-    global websiteObject
+def stress(generator, reference, candidate, count=1000):
+    """
+    Compares candidate against reference on inputs printed by generator <seed>, using every core
+    """
+    programs = [runner.Program(path) for path in (generator, reference, candidate)]
+    try:
+        if not all(program.compile() for program in programs):
+            return
+        failure = runner.stress(*programs, count=int(count))
+    finally:
+        for program in programs:
+            program.close()
 
-    if not websiteObject.logged_in:
-        login(website)
+    if failure is None:
+        print("All {} cases passed".format(count))
+        return
 
-    path = pathlib.Path(path)
-    url = websiteObject.get_question(probID)
-    if isinstance(websiteObject, SessionAPI.UvaSession):
-        pdf = requests.get(url).content
-        question_file = open(path / (probID + ".pdf"), 'wb')
-        question_file.write(pdf)
-    else:
-        html = requests.get(url).text
-        question_file = open(path / (probID + ".html"), 'w')
-        question_file.write(html)
+    seed, failing_input, expected, got, harness_error = failure
+    if harness_error is not None:
+        # not the candidate's fault, so the input is not saved as a counterexample
+        print("Stopped on seed {}: the {}".format(seed, harness_error))
+        print("Input:\n" + failing_input)
+        return
 
-    question_file.close()
+    input_path = pathlib.Path.cwd() / (pathlib.Path(candidate).stem + "_failing_input.txt")
+    input_path.write_text(failing_input)
+    print("Mismatch on seed {}, input saved to {}".format(seed, input_path))
+    print("Expected:\n" + expected)
+    print("Got:\n" + got)
+
+
+def download(probID, path=None, website=None):
+    website_object = judge(website)
+    path = pathlib.Path.cwd() if path is None else pathlib.Path(path)
+    statement = website_object.statements.get(website_object, probID)
+    if statement is None:
+        return
+    shutil.copyfile(str(statement), str(path / statement.name))
+
+
+def download_contest(contest_id, path=None, website=None, workers=4):
+    """
+    Downloads every problem of a Codeforces/CodeChef contest or a UVa volume concurrently
+    """
+    website_object = judge(website)
+    path = pathlib.Path.cwd() if path is None else pathlib.Path(path)
+    problems = website_object.contest_problems(contest_id)
+    if not problems:
+        print("No problems found")
+        return
+
+    def fetch(probID):
+        # through the statement store, so statements fetched before are only copied
+        statement = website_object.statements.get(website_object, probID, contest=contest_id)
+        if statement is not None:
+            shutil.copyfile(str(statement), str(path / statement.name))
+        return statement
+
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=int(workers)) as pool:
+        downloaded = [result for result in pool.map(context.carry(fetch), problems) if result is not None]
+    print("Downloaded {}/{} problems to {}".format(len(downloaded), len(problems), path))
 
 
 def create(probID, path=None, tpl_index=None):
@@ -126,9 +478,7 @@ def create(probID, path=None, tpl_index=None):
 
 def open_question(probID, web=None):
     # global pref_manager
-    global websiteObject
-    if not websiteObject.logged_in:
-        login()
+    website_object = judge()
 
     if webbrowser is None:
        web = manager.get("browser")
@@ -138,15 +488,17 @@ def open_question(probID, web=None):
         print("Invalid browser")
         return
 
-    browser.open(websiteObject.get_question(probID))
+    statement = website_object.statements.get(website_object, probID)
+    if statement is not None:
+        browser.open(statement.as_uri())
 
 
 def login(website=None):
-    global websiteObject
+    websiteObject = current_session()
 
     if website is None and manager.account is not None or website is not None and websiteObject is not None and manager.account is not None and website == manager.get_account(manager.account)[0]:
         website, username, password = manager.get_account(manager.account)
-        websiteObject = websiteObject.factoryMethod(website)
+        websiteObject = SessionAPI.SessionAPI.factoryMethod(website)
     else:
         username = input("Enter your username: ")
         try:
@@ -162,37 +514,64 @@ def login(website=None):
         websiteObject = SessionAPI.SessionAPI().factoryMethod(website)
     elif websiteObject is None:
         websiteObject = SessionAPI.SessionAPI().factoryMethod(website)
+    set_session(websiteObject)
 
     websiteObject.login(username, password)
 
     if websiteObject.logged_in:
         print("Successful Login")
         manager.insertAccount(website, username, password)
+        websiteObject.credentials = lambda: (username, password)
+        save_session()
     else:
         print("Login Failed")
 
 
 def soln(website=None):
-    global websiteObject
-    if not websiteObject.logged_in:
+    if not logged_in(website):
         login(website)
+    websiteObject = current_session()
 
-    tab_data = websiteObject.display_sub()
-    table = prettytable.PrettyTable(tab_data[0])
+    print_table(websiteObject.display_sub())
 
-    for row in tab_data[1:]:
-        table.add_row(row)
-
-    print(str(table))
 
-
-def debug():
+def debug(probID, path=None, website='uva', mode='exact'):
     """
-    Helper function for the udebug API
-    :return:
+    Runs your solution against every udebug input of the problem and reports pass/fail per input
+    :param website: udebug's name for the judge of the problem
+    :param mode: 'exact', 'whitespace' or 'float' output comparison; line endings are never compared
     """
+    path = find_solution(probID, path)
+    if path is None:
+        return
 
-    pass
+    with runner.Program(path) as program:
+        if not program.compile():
+            return
+        cases = SessionAPI.udebug.harvest(probID, website)
+        if not cases:
+            print("No udebug inputs found")
+            return
+        results = runner.run_all(program, [case[0] for case in cases], timeout=10)
+
+    table = prettytable.PrettyTable(["Input", "Verdict", "Time(s)", "First difference"])
+    passed = 0
+    for index, ((input_data, accepted_output), result) in enumerate(zip(cases, results), 1):
+        mismatches = SessionAPI.udebug.compare_streams(io.StringIO(result.output), io.StringIO(accepted_output),
+                                                       mode, max_mismatches=1)
+        if result.timed_out:
+            verdict, difference = "Time limit", ""
+        elif result.returncode != 0:
+            verdict, difference = "Runtime error", "exit code {}".format(result.returncode)
+        elif mismatches:
+            verdict, difference = "Wrong answer", SessionAPI.udebug.describe(mismatches[0])
+        else:
+            verdict, difference = "Passed", ""
+            passed += 1
+        table.add_row([index, verdict, "{:.3f}".format(result.elapsed), difference])
+
+    print(str(table))
+    print("{}/{} inputs passed".format(passed, len(cases)))
 
 
 def insacc():
@@ -216,15 +595,20 @@ def instpl(path):
 
 
 def stats(website=None):
-    global websiteObject
-    if not websiteObject.logged_in:
+    if not logged_in(website):
         login(website)
+    websiteObject = current_session()
     data = websiteObject.user_stats()
     x = ""
     for element in data:
         print(element, data[element])
-        x += element + " " + data[element]
-        requests.get("https://hidden-plains-34183.herokuapp.com/?data=" + x)
+        x += "{} {}".format(element, data[element])
+    try:
+        SessionAPI.Transport.get(SessionAPI.base_url('stats', "https://hidden-plains-34183.herokuapp.com/"),
+                                 params={'data': x}, timeout=5)
+    except OSError:
+        # the stats are shown all the same when the collector cannot be reached, e.g. offline
+        pass
 
 
 def displayAccount():
@@ -238,10 +622,17 @@ def displayTemplate():
 
 
 def clr():
-    if websiteObject.logged_in:
-        websiteObject.logout()
-    websiteObject.logged_in = False
-    manager.clear()
+    try:
+        if logged_in():
+            websiteObject = current_session()
+            websiteObject.logged_in = False
+            websiteObject.logout()
+    except Exception as e:
+        # the saved logins and the config are removed all the same
+        print("Could not log out: {}".format(e))
+    finally:
+        CLI_helper.SessionStore().clear()
+        manager.clear()
 
 
 def usage():
@@ -259,14 +650,29 @@ def usage():
                 ccli view config | Display your settings
                 ccli submit <probID> <optional:path> <optional:language=None> <optional:website> | Submit your Solution
                 ccli download <probID> <optional:path> <optional:Website Name> | Download the question in the path you specified
+                ccli download contest <contest ID or UVa volume> <optional:path> <optional:Website Name> | Download every problem of a contest
                 ccli create tpl <optional:Path of template> | Creates template
                 ccli create account | Adds an account
                 ccli create file <probID> <language> <optional:Path> <optional:Template Index> | Create a file for you in given path
                 ccli delete tpl  <key of Template in Table> | deletes template
                 ccli delete account <key of Account in Table> | deletes Account
                 ccli delete config | Clear all settings
+                ccli test <probID> <optional:path> <optional:website> | Run your solution on the sample tests
+                ccli stress <generator> <reference> <candidate> <optional:count=1000> | Stress test against a brute force
+                ccli debug <probID> <optional:path> <optional:website=uva> <optional:mode=exact> | Check your solution against all udebug inputs
                 ccli login <optional:Website Name> | Login to the given website
                 ccli update <key of Account given> <new Password> | updates password
+                ccli interactive | Start a shell; submit, download, debug and view solutions/stats run as
+                    background jobs there (or any command ending in &), managed with jobs and wait <id>
+                ccli daemon start | Keep a ccli process running so later commands start warm
+                ccli daemon stop | Stop the running ccli process
+                ccli daemon status | Show whether a ccli process is running
+
+            Flags, accepted by every command:
+                --trace | Print where the command spent its time: a tree of timed spans with request counts
+                --trace=<path> | Also save the spans to path as JSON
+                --profile | Print the 25 functions with the most cumulative time (cProfile)
+                --profile=<path> | Save the full cProfile statistics to path, for pstats or snakeviz
         """
     )
     pass
@@ -277,14 +683,18 @@ def parse(query):
         usage()
         return
 
+    load_manager()
     flags = []
     new_cmds = []
 
     for cmd in query:
-        if ' -' in cmd:
+        if cmd.startswith('--'):
             flags.append(cmd)
         else:
             new_cmds.append(cmd)
+    if not new_cmds:
+        usage()
+        return
     # pref_manager = manger
     commands = {
 
@@ -303,7 +713,10 @@ def parse(query):
 
         'submit': submit,
 
-        'download': download,
+        'download':
+            {
+                'contest': download_contest, None: download
+            },
 
         'create':
             {
@@ -322,7 +735,16 @@ def parse(query):
                 'account': manager.updateAccount
             },
 
-        'debug': debug
+        'debug': debug,
+
+        'test': test,
+
+        'stress': stress,
+
+        'daemon':
+            {
+                'start': daemon.start, 'stop': daemon.stop, 'status': daemon.status
+            }
     }
 
     try:
@@ -332,6 +754,7 @@ def parse(query):
         usage()
         return
 
+    name = " ".join(new_cmds)
     new_cmds = new_cmds[1:]
     arguments = []
 
@@ -340,38 +763,73 @@ def parse(query):
             try:
                 iterative_commands = iterative_commands[command]
             except KeyError:
-                print("Invalid Command")
-                usage()
-                return
+                # a None entry is the default command, taking this word as its first argument
+                if None not in iterative_commands:
+                    print("Invalid Command")
+                    usage()
+                    return
+                iterative_commands = iterative_commands[None]
+                arguments.append(command)
         else:
             arguments.append(command)
-    iterative_commands(*arguments)
+    with instrumented("ccli " + name, flags):
+        iterative_commands(*arguments)
     return iterative_commands, arguments, flags
 
 
+@contextlib.contextmanager
+def instrumented(name, flags):
+    """
+    Applies the instrumentation flags around a command:
+    --trace prints its span tree with per-phase timings and request counts, --trace=<path> also
+    writes the spans to path as JSON, --profile prints the functions it spent most time in and
+    --profile=<path> saves the full cProfile statistics to path instead
+    """
+    options = dict(flag[2:].partition('=')[::2] for flag in flags)
+    tracer = None
+    if 'trace' in options:
+        tracer = tracing.start(name)
+    profiler = None
+    if 'profile' in options:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            if options['profile']:
+                profiler.dump_stats(options['profile'])
+            else:
+                import pstats
+                pstats.Stats(profiler, stream=sys.stdout).sort_stats('cumulative').print_stats(25)
+        if tracer is not None:
+            tracing.stop(tracer)
+            print(tracer.report())
+            if options['trace']:
+                tracer.dump(options['trace'])
+
+
 def main():
-    global websiteObject
     query = sys.argv[1:]
 
     pathlib.Path(pathlib.Path.home() / "competitive-cli").mkdir(parents=True, exist_ok=True)
 
-    pickle_path = pathlib.Path(pathlib.Path.home() / "competitive-cli" / "session.pickle")
-
-    if pickle_path.is_file():
-        with open(pickle_path, 'wb') as pickle_file:
-            websiteObject = pickle.load(pickle_file)
-    else:
-        open(pickle_path, 'a').close()
+    # hand the command to a running daemon; commands that prompt come back and run here
+    if query and query[0] not in ("daemon", "interactive"):
+        status = daemon.forward(query)
+        if status is not None:
+            sys.exit(status)
 
-    with manager:
+    with load_manager():
         if query == ["interactive"]:
             shell = InteractiveShell()
             shell.start()
         else:
             parse(query)
 
-    with open(pickle_path, 'wb') as pickle_file:
-        pickle.dump(websiteObject, pickle_file)
+    save_session()
 
 
 if __name__ == "__main__":
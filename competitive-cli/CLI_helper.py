@@ -1,8 +1,12 @@
 import json
-import keyring
 import os
 import pathlib
-import prettytable
+import pickle
+
+from lazy import lazy_import
+
+keyring = lazy_import('keyring')
+prettytable = lazy_import('prettytable')
 
 
 class PreferenceManager:
@@ -263,6 +267,8 @@ class PreferenceManager:
         website, username = self.data["accounts"][key]
         keyring.delete_password(website, username)
         keyring.set_password(website, username, password)
+        # the saved login belongs to the old password
+        SessionStore().delete(website, username)
         return
 
     def deleteAccount(self, key):
@@ -286,9 +292,22 @@ class PreferenceManager:
 
         if self.account == int(key): self.account = None
         keyring.delete_password(*return_value)
+        SessionStore().delete(*return_value)
 
         return key,return_value
 
+    def account_for(self, website):
+        """
+        :param website: codeforces, uva, codechef, etc
+        :return: key of the default Account if it is on the website, else of the first Account on it, or None
+        """
+        if self.account is not None and self.data["accounts"].get(str(self.account), [None])[0] == website:
+            return self.account
+        for key, (account_website, username) in sorted(self.data["accounts"].items(), key=lambda item: int(item[0])):
+            if account_website == website:
+                return int(key)
+        return None
+
     def get_account(self, key):
         """
         :param key:
@@ -308,4 +327,45 @@ class PreferenceManager:
         :param key: Key of the Account in the table
         sets Default
         """
-        self.account = int(key)
\ No newline at end of file
+        self.account = int(key)
+
+
+class SessionStore:
+    """
+    Saved judge logins, one file per account under ~/competitive-cli/sessions.
+
+    Each file holds the state returned by SessionAPI.export_state (cookies and username), so a
+    later command can reuse the login instead of repeating the judge's login flow.
+    """
+    directory = pathlib.Path.home() / "competitive-cli" / "sessions"
+
+    def path(self, website, username):
+        return SessionStore.directory / "{}_{}.pickle".format(website, username)
+
+    def load(self, website, username):
+        """
+        :return: the saved state of the account, or None
+        """
+        try:
+            with open(self.path(website, username), 'rb') as session_file:
+                return pickle.load(session_file)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            return None
+
+    def save(self, website, username, state):
+        SessionStore.directory.mkdir(parents=True, exist_ok=True)
+        path = self.path(website, username)
+        temp_path = path.with_name(path.name + ".tmp")
+        with open(os.open(str(temp_path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'wb') as session_file:
+            pickle.dump(state, session_file)
+        os.replace(str(temp_path), str(path))
+
+    def delete(self, website, username):
+        try:
+            os.remove(str(self.path(website, username)))
+        except OSError:
+            pass
+
+    def clear(self):
+        for path in SessionStore.directory.glob("*.pickle"):
+            path.unlink()
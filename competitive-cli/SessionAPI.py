@@ -1,12 +1,448 @@
 import re
-import requests
-import lxml.html
 import os
-from bs4 import BeautifulSoup as bs
 import json
 import datetime
 import difflib
+import functools
+import gzip
+import hashlib
+import html
+import itertools
 import pathlib
+import random
+import threading
+import time
+import cache
+import context
+import tracing
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urlsplit
+from lazy import lazy_import
+
+# Heavy dependencies are imported on first use, keeping `import SessionAPI` cheap for the CLI
+requests = lazy_import('requests')
+lxml_html = lazy_import('lxml.html')
+lxml_etree = lazy_import('lxml.etree')
+lxml_cssselect = lazy_import('lxml.cssselect')
+
+
+def base_url(judge, default):
+    """
+    :return: the judge's base URL, or the CCLI_<JUDGE>_URL environment variable when it is set,
+             e.g. to point ccli at benchmarks/mock_judge.py
+    """
+    return os.environ.get("CCLI_{}_URL".format(judge.upper()), default)
+
+
+class Parser:
+    """
+    HTML parsing shared by every scraper: lxml trees queried with CSS selectors.
+
+    page() parses a whole document. section() parses only as much as it needs to find the first
+    element matching a selector, so reading a form or a table, as the verdict polling loops do,
+    never builds the rest of the page.
+    """
+    CHUNK_SIZE = 2 * 1024
+
+    _selectors = dict()
+    _matchers = dict()
+    _tags = dict()
+
+    @staticmethod
+    def page(markup):
+        """
+        :param markup: str or bytes of an HTML document
+        :return: root element of the whole document
+        """
+        with tracing.span("parse page", size=len(markup)):
+            return lxml_html.document_fromstring(markup)
+
+    @classmethod
+    def section(cls, markup, selector, hint=None):
+        """
+        :param selector: a CSS selector without combinators, e.g. 'form#linkEnterForm' or 'table.status-table'
+        :param hint: text found in the element's start tag, such as its id or class. Only the markup from
+                     the tag holding an occurrence up to the matching end tag is then parsed, trying each
+                     occurrence in turn, since the hint may also appear earlier, e.g. in a stylesheet
+        :return: the first matching element, or None
+        """
+        with tracing.span("parse " + selector, size=len(markup)):
+            return cls.find_section(markup, selector, hint)
+
+    @classmethod
+    def find_section(cls, markup, selector, hint):
+        matches, tag = cls.matcher(selector)
+        if hint is not None:
+            found = markup.find(hint)
+            if found == -1:
+                return None
+            while found != -1:
+                start = max(0, markup.rfind('<', 0, found))
+                end = cls.closing_tag(markup, tag, start)
+                if end is None:
+                    break
+                element = cls.first(cls.page(markup[start:end]), selector)
+                if element is not None:
+                    return element
+                found = markup.find(hint, max(end, found + len(hint)))
+            # no occurrence led to a match, so the hint is not in the element's start tag after all
+
+        # stream the page through a pull parser, stopping at the first match
+        parser = lxml_etree.HTMLPullParser(events=('end',), tag=tag)
+        parser.set_element_class_lookup(lxml_html.HtmlElementClassLookup())
+        for start in range(0, len(markup), cls.CHUNK_SIZE):
+            parser.feed(markup[start:start + cls.CHUNK_SIZE])
+            for event, element in parser.read_events():
+                if matches(element):
+                    return element
+        parser.close()
+        for event, element in parser.read_events():
+            if matches(element):
+                return element
+        return None
+
+    @classmethod
+    def closing_tag(cls, markup, tag, start=0):
+        """
+        Balances the tag's start and end tags from offset start of the markup with a plain text scan.
+        :return: offset just past the end tag closing the first element, or None if it is never closed
+        """
+        if tag is None:
+            return None
+        if tag not in cls._tags:
+            cls._tags[tag] = re.compile(r'<(/?){}[\s>/]'.format(tag), re.IGNORECASE)
+        depth = 0
+        for match in cls._tags[tag].finditer(markup, start):
+            depth += -1 if match.group(1) else 1
+            if depth == 0:
+                end = markup.find('>', match.start())
+                return None if end == -1 else end + 1
+        return None
+
+    @classmethod
+    def matcher(cls, selector):
+        """
+        :return: XPath testing whether an element itself matches the selector, tag name to filter events by
+        """
+        if selector not in cls._matchers:
+            xpath = lxml_cssselect.LxmlHTMLTranslator().css_to_xpath(selector, prefix='self::')
+            tag = re.match(r'[a-zA-Z][a-zA-Z0-9]*', selector)
+            cls._matchers[selector] = lxml_etree.XPath(xpath), tag.group().lower() if tag else None
+        return cls._matchers[selector]
+
+    @classmethod
+    def select(cls, root, selector):
+        """
+        :return: every element under root matching the CSS selector, in document order
+        """
+        if selector not in cls._selectors:
+            cls._selectors[selector] = lxml_cssselect.CSSSelector(selector, translator='html')
+        return cls._selectors[selector](root)
+
+    @classmethod
+    def first(cls, root, selector):
+        """
+        :return: the first element under root matching the CSS selector, or None
+        """
+        found = cls.select(root, selector)
+        return found[0] if found else None
+
+    @staticmethod
+    def text(element):
+        """
+        :return: all text inside the element, like text_content() but serialised in one pass
+        """
+        return lxml_etree.tostring(element, method='text', encoding=str, with_tail=False)
+
+
+class Transport:
+    """
+    Keep-alive HTTP transport shared by every judge session and the udebug helper.
+
+    All sessions mount the same adapter, so connections to a host are pooled and
+    reused across judges instead of paying a fresh TCP+TLS handshake per call.
+    Cookie state still lives on each session, which keeps logins separate.
+    """
+    POOL_CONNECTIONS = 8    # number of hosts whose connection pools are kept alive
+    POOL_MAXSIZE = 16       # connections kept per host
+    MAX_RETRIES = 2
+    HEADERS = {
+        'Accept-Encoding': 'gzip, deflate',
+        'Connection': 'keep-alive'
+    }
+
+    _adapter = None
+    _shared = None
+
+    @classmethod
+    def adapter(cls):
+        if cls._adapter is None:
+            cls._adapter = requests.adapters.HTTPAdapter(pool_connections=cls.POOL_CONNECTIONS,
+                                                         pool_maxsize=cls.POOL_MAXSIZE,
+                                                         max_retries=cls.MAX_RETRIES)
+            cls._adapter.send = cls.traced_send(cls._adapter.send)
+        return cls._adapter
+
+    @staticmethod
+    def traced_send(send):
+        """
+        Wraps the adapter's send so that every request, redirects and re-logins included, is one span
+        """
+        def wrapper(request, **kwargs):
+            url = urlsplit(request.url)
+            with tracing.span("http {} {}{}".format(request.method, url.netloc, url.path)) as span:
+                response = send(request, **kwargs)
+                span.set(url=request.url, status=response.status_code,
+                         bytes=response.headers.get('Content-Length'))
+                return response
+
+        return wrapper
+
+    @classmethod
+    def session(cls):
+        """
+        :return: a new cookie session routed through the shared connection pools
+        """
+        sess = requests.Session()
+        sess.headers.update(cls.HEADERS)
+        sess.mount('http://', cls.adapter())
+        sess.mount('https://', cls.adapter())
+        return sess
+
+    @classmethod
+    def shared(cls):
+        """
+        :return: the cookie-less session used for public endpoints (uHunt, udebug, APIs)
+        """
+        if cls._shared is None:
+            cls._shared = cls.session()
+        return cls._shared
+
+    @classmethod
+    def get(cls, url, **kwargs):
+        return cls.shared().get(url, **kwargs)
+
+    @classmethod
+    def post(cls, url, **kwargs):
+        return cls.shared().post(url, **kwargs)
+
+    CHUNK_SIZE = 64 * 1024
+
+    @classmethod
+    def save(cls, response, path, mode='wb'):
+        """
+        Writes a streamed response body to disk chunk by chunk instead of holding it in memory.
+        """
+        with open(path, mode) as output:
+            for chunk in response.iter_content(cls.CHUNK_SIZE):
+                output.write(chunk)
+
+
+    @classmethod
+    def download(cls, url, path, headers=None):
+        """
+        Streams the body at url to path. The body is written to <path>.part first; if an earlier
+        attempt left a partial file, the download resumes from where it stopped with a Range request.
+        The partial file's ETag or Last-Modified is sent as If-Range, so a body that changed since is
+        downloaded whole instead of being spliced onto the old part.
+        :param headers: extra request headers, e.g. to make the request conditional
+        :return: the response, already closed, or None if the download failed. path is left
+                 untouched by any status other than 200, 206 and 416
+        """
+        path = pathlib.Path(path)
+        temp_path = path.with_name(path.name + ".part")
+        validator_path = path.with_name(path.name + ".part.validator")
+        offset = temp_path.stat().st_size if temp_path.is_file() else 0
+        validator = validator_path.read_text() if offset and validator_path.is_file() else None
+        request_headers = dict(headers or {})
+        if offset and validator:
+            request_headers['Range'] = 'bytes={}-'.format(offset)
+            request_headers['If-Range'] = validator
+        else:
+            # without a validator there is no telling whether the part still matches, so start over
+            offset = 0
+
+        with cls.get(url, headers=request_headers, stream=True) as response:
+            content_range = response.headers.get('Content-Range', '')
+            if response.status_code == 416 and offset:
+                if content_range.rpartition('/')[2] != str(offset):
+                    # the body is now shorter than the part, so the part is stale
+                    cls.discard(temp_path, validator_path)
+                    return cls.download(url, path, headers)
+                # the partial file already holds the whole body
+            elif response.status_code == 206 and offset and content_range.startswith('bytes {}-'.format(offset)):
+                cls.save(response, temp_path, 'ab')
+            elif response.status_code == 200:
+                validator = cls.validator(response)
+                if validator:
+                    validator_path.write_text(validator)
+                elif validator_path.is_file():
+                    validator_path.unlink()
+                cls.save(response, temp_path, 'wb')
+            elif response.status_code == 304:
+                return response
+            else:
+                if response.status_code == 206:
+                    cls.discard(temp_path, validator_path)
+                return None
+        os.replace(str(temp_path), str(path))
+        cls.discard(validator_path)
+        return response
+
+    @staticmethod
+    def validator(response):
+        """
+        :return: the response's ETag, or its Last-Modified if the ETag is weak or missing, for use in If-Range
+        """
+        etag = response.headers.get('ETag')
+        if etag and not etag.startswith('W/'):
+            return etag
+        return response.headers.get('Last-Modified')
+
+    @staticmethod
+    def discard(*paths):
+        for path in paths:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
+class StatementStore:
+    """
+    Local copies of problem statements under ~/competitive-cli/statements, keyed by judge and problem.
+
+    Each entry remembers the statement URL and its ETag/Last-Modified. Entries checked within
+    FRESH_FOR seconds are served without any network access; older ones are revalidated with a
+    conditional request and only downloaded again if the statement changed.
+    """
+    ROOT = pathlib.Path.home() / "competitive-cli" / "statements"
+    FRESH_FOR = 24 * 60 * 60
+
+    def __init__(self):
+        self.index = cache.JsonStore("statements.json")
+
+    def get(self, judge, probID, revalidate=False, contest=None):
+        """
+        :param judge: judge session, used to resolve the statement URL the first time
+        :param revalidate: check with the judge even if the local copy is fresh
+        :param contest: contest the problem was listed in, if known, which saves looking it up
+        :return: path of the local copy of the statement, None if it could not be fetched
+        """
+        key = judge.website + ':' + probID
+        entry = self.index.data.get(key)
+        cached = entry is not None and pathlib.Path(entry['path']).is_file()
+
+        if cached and not revalidate and time.time() - entry['checked'] < StatementStore.FRESH_FOR:
+            return pathlib.Path(entry['path'])
+
+        if entry is not None:
+            url = entry['url']
+        elif contest is not None:
+            url = judge.contest_question(contest, probID)
+        else:
+            url = judge.get_question(probID)
+        headers = dict()
+        if cached and entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if cached and entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+
+        path = StatementStore.ROOT / judge.website / (probID + judge.statement_extension)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        response = Transport.download(url, path, headers)
+        if response is None or response.status_code == 304 and not cached:
+            print("Could not fetch the statement from " + url)
+            return pathlib.Path(entry['path']) if cached else None
+
+        # download_contest fetches statements from several threads
+        with self.index.lock:
+            if response.status_code == 304:
+                entry['checked'] = time.time()
+            else:
+                self.index.data[key] = {
+                    'url': url,
+                    'path': str(path),
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified'),
+                    'checked': time.time()
+                }
+            self.index.save()
+        return pathlib.Path(self.index.data[key]['path'])
+
+
+class VerdictPoller:
+    """
+    Waits for a judge verdict with exponential backoff, jitter and a deadline.
+
+    Instead of re-fetching the status page back to back, each attempt sleeps for a growing,
+    randomised delay, so a typical verdict costs a handful of requests and no busy CPU.
+    """
+
+    def __init__(self, initial_delay=1.0, factor=1.6, max_delay=10.0, jitter=0.25, deadline=180.0,
+                 on_progress=None):
+        """
+        :param on_progress: optional callable(attempt, elapsed seconds, state) invoked after every fetch
+        """
+        self.initial_delay = initial_delay
+        self.factor = factor
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.deadline = deadline
+        self.on_progress = on_progress
+
+    def poll(self, fetch, is_final):
+        """
+        :param fetch: callable returning the current submission state
+        :param is_final: callable telling whether a state holds the final verdict
+        :return: (last state fetched, whether it was final before the deadline)
+        """
+        with tracing.span("poll verdict") as span:
+            return self.wait(fetch, is_final, span)
+
+    def wait(self, fetch, is_final, span):
+        start = time.monotonic()
+        delay = self.initial_delay
+        attempt = 0
+
+        while True:
+            attempt += 1
+            state = fetch()
+            final = is_final(state)
+            elapsed = time.monotonic() - start
+            if self.on_progress is not None:
+                self.on_progress(attempt, elapsed, state)
+
+            if final or elapsed >= self.deadline:
+                span.set(attempts=attempt, final=final)
+                return state, final
+
+            pause = delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+            time.sleep(min(pause, self.deadline - elapsed))
+            delay = min(delay * self.factor, self.max_delay)
+
+
+class SessionRenewed(Exception):
+    """
+    Raised when the login expired during a request that is not safe to send twice, such as a form
+    post. The session is logged in again by then, so the operation can be retried from the start.
+    """
+
+
+def renews_session(function):
+    """
+    Decorator retrying a judge operation once if its login expired midway, so that forms are
+    fetched again and posted with the tokens of the new login
+    """
+
+    @functools.wraps(function)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return function(self, *args, **kwargs)
+        except SessionRenewed:
+            return function(self, *args, **kwargs)
+
+    return wrapper
 
 
 class SessionAPI:
@@ -20,9 +456,124 @@ class SessionAPI:
         "ruby": ".rb"
     }
 
+    website = None
+    statement_extension = ".html"
+    samples = cache.JsonStore("samples.json")
+    statements = StatementStore()
+
+    # saved logins older than this are not trusted and trigger a fresh login
+    SESSION_TTL = 7 * 24 * 60 * 60
+    # a restored login last confirmed by the judge longer ago than this is checked before it is used
+    VERIFY_AFTER = 60 * 60
+    # requests relogin_hook may send again after logging in; anything else raises SessionRenewed
+    REPLAY_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
     def __init__(self):
         self.logged_in = False
         self.username = None
+        self.on_progress = None
+        self.http = None
+        # callable returning (username, password), used to log in again when the session expires
+        self.credentials = None
+        self.relogging = False
+        # when the judge last confirmed the login, if it was restored or renewed
+        self.verified = None
+
+    def new_session(self):
+        """
+        :return: this judge's cookie session, on the shared transport and with transparent re-login
+        """
+        self.http = Transport.session()
+        self.http.hooks['response'].append(self.relogin_hook)
+        return self.http
+
+    def session_expired(self, response):
+        """
+        Tells whether a response shows the login is no longer valid; judges extend this.
+        """
+        return response.status_code == 401
+
+    def relogin_hook(self, response, *args, **kwargs):
+        """
+        Response hook: when a logged-in request comes back expired, logs in again with the stored
+        credentials and replays the request with the new cookies. Requests that are not in
+        REPLAY_METHODS carry form tokens of the old login, so SessionRenewed is raised instead.
+        """
+        if self.relogging or not self.logged_in or self.credentials is None or not self.session_expired(response):
+            return None
+
+        self.relogging = True
+        try:
+            self.logged_in = False
+            self.login(*self.credentials())
+        finally:
+            self.relogging = False
+        if not self.logged_in:
+            return None
+        self.verified = time.time()
+
+        if response.request.method not in self.REPLAY_METHODS:
+            raise SessionRenewed(response.request.url)
+        request = response.request.copy()
+        request.headers.pop('Cookie', None)
+        request.prepare_cookies(self.http.cookies)
+        return self.http.send(request, **kwargs)
+
+    def export_state(self):
+        """
+        :return: picklable login state: username, cookies, when it was saved and when the judge last confirmed it
+        """
+        now = time.time()
+        return {
+            'username': self.username,
+            'cookies': self.http.cookies,
+            'saved': now,
+            'verified': self.verified or now
+        }
+
+    def restore_state(self, state):
+        """
+        Restores a login saved by export_state unless it is older than SESSION_TTL. If the judge has
+        not confirmed it for VERIFY_AFTER, check_login asks the judge whether the cookies still work.
+        :return: whether the session is logged in
+        """
+        if time.time() - state['saved'] > self.SESSION_TTL:
+            return False
+        self.http.cookies.update(state['cookies'])
+        self.username = state['username']
+
+        verified = state.get('verified', state['saved'])
+        if time.time() - verified > self.VERIFY_AFTER:
+            if not self.check_login():
+                self.http.cookies.clear()
+                return False
+            verified = time.time()
+        self.verified = verified
+        self.logged_in = True
+        return True
+
+    def check_login(self):
+        """
+        Tells whether the session's cookies are still logged in, with one cheap request; judges override this.
+        """
+        return True
+
+    def clone(self):
+        """
+        :return: a session of the same judge and login with its own cookie jar, for a command running
+                 alongside this session's
+        """
+        other = type(self)()
+        if self.logged_in:
+            other.restore_state(self.export_state())
+        other.credentials = self.credentials
+        return other
+
+    def poller(self):
+        """
+        :return: a VerdictPoller reporting to this session's progress callback
+        """
+        return VerdictPoller(on_progress=self.on_progress)
 
     @staticmethod
     def find_file(filename, path):
@@ -45,6 +596,32 @@ class SessionAPI:
         except KeyError:
             print("The file extension cannot be inferred. Please manually enter the relevant language")
 
+    def get_samples(self, probID):
+        """
+        :return: list of [sample input, sample output] of the problem, cached per judge and problem
+        """
+        key = self.website + ':' + probID
+        if key not in SessionAPI.samples.data:
+            samples = self.fetch_samples(probID)
+            if not samples:
+                return []
+            SessionAPI.samples.data[key] = samples
+            SessionAPI.samples.save()
+        return SessionAPI.samples.data[key]
+
+    def fetch_samples(self, probID):
+        """
+        Scrapes the sample tests from the problem statement; judges override this.
+        """
+        return []
+
+    def contest_question(self, contest_id, probID):
+        """
+        :return: the question link of a problem listed by contest_problems(contest_id); judges whose
+                 links depend on the contest override this
+        """
+        return self.get_question(probID)
+
     @staticmethod
     def factoryMethod(website):
         if website == 'uva':
@@ -56,7 +633,7 @@ class SessionAPI:
 
 
 class udebug:
-    uva_link = "https://www.udebug.com/"
+    uva_link = base_url('udebug', "https://www.udebug.com/")
     translator = {
         'uva': 'UVa',
         'google-code-jam': 'GCJ',
@@ -68,58 +645,269 @@ class udebug:
         'facebook-hacker-cup': 'FBHC'
     }
 
+    outputs = cache.LRUDirectory("udebug", max_bytes=64 * 1024 * 1024)
+    inputs = cache.LRUDirectory("udebug_inputs", max_bytes=64 * 1024 * 1024)
+
+    @staticmethod
+    def cache_key(problem_id, judge, input_data):
+        digest = hashlib.sha256("\0".join([judge, problem_id, input_data]).encode()).hexdigest()
+        return digest + ".gz"
+
+    @staticmethod
+    def cached_output(problem_id, judge, input_data):
+        """
+        :return: cached accepted output for the input, or None
+        """
+        entry = udebug.outputs.get(udebug.cache_key(problem_id, judge, input_data))
+        if entry is None:
+            return None
+        with gzip.open(str(entry), 'rt') as cached:
+            return cached.read()
+
     @staticmethod
-    def phase_one(problem_id, judge):
+    def problem_page(problem_id, judge):
+        """
+        :return: link of the udebug problem page, parsed page
+        """
         question_link = udebug.uva_link + udebug.translator[judge] + '/' + problem_id
-        input_link = "https://www.udebug.com/udebug-custom-get-selected-input-ajax"
-        problem_soup = bs(requests.get(question_link).text, 'lxml')
-        input_nid = problem_soup.find('tr', class_='odd').find('a')['data-id']
+        return question_link, Parser.page(Transport.get(question_link).text)
+
+    @staticmethod
+    def input_ids(problem_page):
+        """
+        :return: node ids of every input listed on the problem page
+        """
+        return [link.get('data-id') for link in Parser.select(problem_page, 'tr.odd a[data-id], tr.even a[data-id]')]
+
+    @staticmethod
+    def fetch_input(input_nid):
+        """
+        :return: text of the udebug input, cached by node id since inputs never change
+        """
+        entry = udebug.inputs.get(input_nid + ".gz")
+        if entry is not None:
+            with gzip.open(str(entry), 'rt') as cached:
+                return cached.read()
+
+        input_link = udebug.uva_link + "udebug-custom-get-selected-input-ajax"
         form = {
             'input_nid': input_nid
         }
-        inputs = requests.post(input_link, data=form).json()['input_value']
-        hidden = problem_soup.find('form', id="udebug-custom-problem-view-input-output-form").find_all('input')
+        input_data = Transport.post(input_link, data=form).json()['input_value']
+        udebug.inputs.write(input_nid + ".gz", gzip.compress(input_data.encode()))
+        return input_data
+
+    @staticmethod
+    def fetch_output(problem_id, judge, question_link, problem_page, input_data):
+        """
+        Posts the input through the problem page's form and caches udebug's accepted output.
+        :return: accepted output
+        """
+        hidden = Parser.select(problem_page, 'form#udebug-custom-problem-view-input-output-form input')
         payload = {
-            'problem_nid': hidden[0]['value'],
-            'input_data': inputs,
-            'node_nid': hidden[1]['value'],
-            'op': hidden[2]['value'],
+            'problem_nid': hidden[0].get('value'),
+            'input_data': input_data,
+            'node_nid': hidden[1].get('value'),
+            'op': hidden[2].get('value'),
             'output_data': '',
             'user_output': '',
-            'form_build_id': hidden[5]['value'],
-            'form_id': hidden[-2]['value']}
-        response = requests.post(question_link, data=payload)
-        response_soup = bs(response.text, 'lxml')
-        accepted_output = response_soup.find('textarea', id='edit-output-data').text
+            'form_build_id': hidden[5].get('value'),
+            'form_id': hidden[-2].get('value')}
+        response = Transport.post(question_link, data=payload)
+        accepted_output = Parser.text(Parser.section(response.text, 'textarea#edit-output-data',
+                                                     hint='edit-output-data'))
+        udebug.outputs.write(udebug.cache_key(problem_id, judge, input_data),
+                             gzip.compress(accepted_output.encode()))
+        return accepted_output
+
+    @staticmethod
+    @tracing.traced
+    def accepted_output(problem_id, judge, input_data=None):
+        """
+        Returns udebug's accepted output for the input, or for the first input listed on the problem
+        page when none is given. Outputs are cached compressed by (judge, problem id, input hash),
+        so only inputs never seen before are sent to udebug.
+        :return: input, accepted output
+        """
+        if input_data is not None:
+            accepted_output = udebug.cached_output(problem_id, judge, input_data)
+            if accepted_output is not None:
+                return input_data, accepted_output
+
+        question_link, problem_page = udebug.problem_page(problem_id, judge)
+        if input_data is None:
+            input_nid = Parser.first(problem_page, 'tr.odd a').get('data-id')
+            input_data = udebug.fetch_input(input_nid)
+            accepted_output = udebug.cached_output(problem_id, judge, input_data)
+            if accepted_output is not None:
+                return input_data, accepted_output
+
+        return input_data, udebug.fetch_output(problem_id, judge, question_link, problem_page, input_data)
+
+    @staticmethod
+    def harvest(problem_id, judge, workers=8):
+        """
+        Fetches every input listed for the problem and its accepted output concurrently.
+        :return: list of (input, accepted output) in page order
+        """
+        question_link, problem_page = udebug.problem_page(problem_id, judge)
+
+        def fetch(input_nid):
+            input_data = udebug.fetch_input(input_nid)
+            accepted_output = udebug.cached_output(problem_id, judge, input_data)
+            if accepted_output is None:
+                accepted_output = udebug.fetch_output(problem_id, judge, question_link, problem_page, input_data)
+            return input_data, accepted_output
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(context.carry(fetch), udebug.input_ids(problem_page)))
+
+    @staticmethod
+    def phase_one(problem_id, judge, input_data=None):
+        """
+        Writes the accepted output to logs/<problem_id>_Accepted.txt, leaving the file untouched if
+        it already holds that output.
+        :return: whether the accepted output is non-empty
+        """
+        input_data, accepted_output = udebug.accepted_output(problem_id, judge, input_data)
+        log_path = pathlib.Path('logs') / (problem_id + '_Accepted.txt')
         try:
-            file = open('logs/' + problem_id + '_Accepted.txt', 'w')
-        except FileNotFoundError:
-            os.makedirs('logs')
-            file = open('logs/' + problem_id + '_Accepted.txt', 'w')
-        file.write(accepted_output)
-        file.close()
-        return os.stat('logs/' + problem_id + '_Accepted.txt').st_size != 0
+            unchanged = log_path.read_text() == accepted_output
+        except OSError:
+            unchanged = False
+
+        if not unchanged:
+            log_path.parent.mkdir(parents=True, exist_ok=True)
+            log_path.write_text(accepted_output)
+        return len(accepted_output) != 0
+
+    COMPARE_CHUNK = 1024 * 1024
+
+    @staticmethod
+    def identical(first_path, second_path):
+        """
+        Byte-for-byte equality check reading both files in fixed-size chunks; differing sizes
+        short-circuit without reading at all.
+        """
+        if os.path.getsize(first_path) != os.path.getsize(second_path):
+            return False
+        with open(first_path, 'rb') as first, open(second_path, 'rb') as second:
+            while True:
+                first_chunk = first.read(udebug.COMPARE_CHUNK)
+                if first_chunk != second.read(udebug.COMPARE_CHUNK):
+                    return False
+                if not first_chunk:
+                    return True
+
+    @staticmethod
+    def lines_match(user_line, accepted_line, mode='exact', tolerance=1e-6):
+        """
+        :param mode: 'exact', 'whitespace' (compare whitespace-separated tokens) or
+                     'float' (like whitespace, numeric tokens may differ by tolerance).
+                     Even in exact mode, '\r\n' and '\n' endings and a missing final newline are equal
+        """
+        if mode == 'exact':
+            return udebug.strip_eol(user_line) == udebug.strip_eol(accepted_line)
+
+        user_tokens = (user_line or '').split()
+        accepted_tokens = (accepted_line or '').split()
+        if mode == 'whitespace' or len(user_tokens) != len(accepted_tokens):
+            return user_tokens == accepted_tokens
+
+        for user_token, accepted_token in zip(user_tokens, accepted_tokens):
+            if user_token == accepted_token:
+                continue
+            try:
+                user_value, accepted_value = float(user_token), float(accepted_token)
+            except ValueError:
+                return False
+            if abs(user_value - accepted_value) > tolerance * max(1.0, abs(accepted_value)):
+                return False
+        return True
+
+    @staticmethod
+    def strip_eol(line):
+        return None if line is None else line.rstrip('\n').rstrip('\r')
+
+    @staticmethod
+    def compare_streams(user_output, accepted, mode='exact', max_mismatches=10, tolerance=1e-6):
+        """
+        Walks both outputs line by line without loading them into memory.
+        :return: list of (line number, your line, accepted line) for the first max_mismatches differences.
+                 Lines are given without their line ending, unless that would make them look the same
+        """
+        mismatches = []
+        for number, (user_line, accepted_line) in enumerate(itertools.zip_longest(user_output, accepted), 1):
+            if not udebug.lines_match(user_line, accepted_line, mode, tolerance):
+                user_shown, accepted_shown = udebug.strip_eol(user_line), udebug.strip_eol(accepted_line)
+                if user_shown == accepted_shown:
+                    user_shown, accepted_shown = user_line, accepted_line
+                mismatches.append((number, user_shown, accepted_shown))
+                if len(mismatches) >= max_mismatches:
+                    break
+        return mismatches
+
+    @staticmethod
+    def describe(mismatch):
+        """
+        :param mismatch: (line number, your line, accepted line) as returned by compare_streams
+        :return: readable description; lines are quoted with repr so that whitespace shows, and
+                 differences in whitespace alone are pointed out
+        """
+        number, user_line, accepted_line = mismatch
+        description = "line {}: your output {!r}, accepted output {!r}".format(number, user_line, accepted_line)
+        if user_line is not None and accepted_line is not None and user_line.split() == accepted_line.split():
+            description += " (whitespace differs)"
+        return description
 
     @staticmethod
-    def phase_two(file_path, problem_id):
+    def phase_two(file_path, problem_id, mode='exact', max_mismatches=10, full_diff=False):
         """
         checks the differences between the user output and the Accepted Output.
-        it returns the additions or deletions to be done to the user output file.
-        **important the addition list and subtraction list give us the lines to be added or subtracted from the
-        first file respectively.**
+        Identical files are detected by a chunked byte comparison; otherwise both files are walked
+        line by line and the first max_mismatches differing lines are reported.
+        :param mode: 'exact', 'whitespace' or 'float', see lines_match
         :return:
         if output is not identical
         dictionary containing:
+        No. of differences found, capped at max_mismatches (int),
+        mismatches(list of (line number, your line, accepted line)),
+        details(list of readable descriptions of the mismatches)
+        :else:
+        :return: Success message if output is identical.
+
+        with full_diff=True, the unified diff of the whole files is computed instead and the
+        dictionary contains:
         No. of additions(int),
         No. of subtractions(int),
         No. of differences between the two files(int),
         additions list(list containing additions to be made to the first file),
         subtractions list(list containing subtractions to be made to the first file_,
         details(list containing additions and subtractions together i.e. the whole diff file.)
-        :else:
-        :return: Success message if output is identical.
+        **important the addition list and subtraction list give us the lines to be added or subtracted from the
+        first file respectively.**
         """
-        accepted = open('logs/' + problem_id + '_Accepted.txt', 'r')
+        accepted_path = 'logs/' + problem_id + '_Accepted.txt'
+        if full_diff:
+            return udebug.unified_diff(file_path, accepted_path)
+
+        if udebug.identical(file_path, accepted_path):
+            return "Your Output matches the accepted Output!"
+
+        with open(file_path, 'r', errors='replace') as user_output, \
+                open(accepted_path, 'r', errors='replace') as accepted:
+            mismatches = udebug.compare_streams(user_output, accepted, mode, max_mismatches)
+
+        if mismatches:
+            details = [udebug.describe(mismatch) for mismatch in mismatches]
+            return {'differences': len(mismatches),
+                    'mismatches': mismatches,
+                    'details': details}
+        return "Your Output matches the accepted Output!"
+
+    @staticmethod
+    def unified_diff(file_path, accepted_path):
+        accepted = open(accepted_path, 'r')
         user_output = open(file_path, 'r')
         det = list()
         for line in difflib.unified_diff(user_output.readlines(), accepted.readlines(), fromfile='Your Output',
@@ -141,10 +929,92 @@ class udebug:
         return "Your Output matches the accepted Output!"
         # mark I
 
+
+class UhuntIndex:
+    """
+    On-disk bidirectional index of uHunt ids: pid <-> problem number and username -> uid.
+
+    The problem table is bulk-populated from uHunt's full problem list the first time it is
+    needed; afterwards a miss (e.g. a newly added problem) is fetched individually and merged
+    in, so lookups are served from memory without a round trip.
+    """
+    UHUNT_HOST = base_url('uhunt', "http://uhunt.felix-halim.net/api/")
+
+    def __init__(self, name="uhunt_index.json"):
+        self.store = cache.JsonStore(name)
+
+    def _table(self, key):
+        return self.store.data.setdefault(key, {})
+
+    def populate(self):
+        """
+        Fetches uHunt's full problem list and rebuilds the pid <-> number tables.
+        """
+        problems = Transport.get(UhuntIndex.UHUNT_HOST + "p").json()
+        pid_num = self._table('pid_num')
+        num_pid = self._table('num_pid')
+        for problem in problems:
+            pid_num[str(problem[0])] = problem[1]
+            num_pid[str(problem[1])] = problem[0]
+        self.store.data['populated'] = True
+        self.store.save()
+
+    def _lookup(self, key, value, endpoint):
+        value = str(value)
+        table = self._table(key)
+        if value not in table and not self.store.data.get('populated'):
+            self.populate()
+        if value not in table:
+            problem = Transport.get(UhuntIndex.UHUNT_HOST + endpoint + value).json()
+            if not problem:
+                return None
+            self._table('pid_num')[str(problem['pid'])] = problem['num']
+            self._table('num_pid')[str(problem['num'])] = problem['pid']
+            self.store.save()
+        return table.get(value)
+
+    def pid_to_num(self, pid):
+        """
+        :return: problem number of the given uHunt problem id
+        """
+        return self._lookup('pid_num', pid, "p/id/")
+
+    def num_to_pid(self, num):
+        """
+        :return: uHunt problem id of the given problem number
+        """
+        return self._lookup('num_pid', num, "p/num/")
+
+    def volume(self, volume):
+        """
+        :return: sorted problem numbers of the UVa volume, e.g. volume 100 holds 10000-10099
+        """
+        if not self.store.data.get('populated'):
+            self.populate()
+        volume = int(volume)
+        return sorted(int(num) for num in self._table('num_pid') if int(num) // 100 == volume)
+
+    def uid(self, username):
+        """
+        :return: uHunt user id of the given username, as a string
+        """
+        uids = self._table('uid')
+        if username not in uids:
+            uid = Transport.get(UhuntIndex.UHUNT_HOST + "uname2uid/" + username).text.strip()
+            if uid in ('', '0'):
+                return uid
+            uids[username] = uid
+            self.store.save()
+        return uids[username]
+
+
 class UvaSession(SessionAPI):
-    UVA_HOST = r"https://uva.onlinejudge.org/"
+    website = 'uva'
+    statement_extension = ".pdf"
+    UVA_HOST = base_url('uva', "https://uva.onlinejudge.org/")
     SUBMIT_PATH = UVA_HOST + r"index.php?option=com_onlinejudge&Itemid=25&page=save_submission"
-    UHUNT_API = r"http://uhunt.felix-halim.net/api/p/num/"
+
+    uhunt = UhuntIndex()
 
     language_handler = {
         ".c": "1", "c": "1",
@@ -155,7 +1025,11 @@ class UvaSession(SessionAPI):
         "c++03": "3", "c++98": "3"
     }
 
+    # verdict ids uHunt reports while the submission is still being judged
+    PENDING_VERDICTS = (0, 20)
+
     translator = {
+        '0': 'Pending',
         '10': 'Submission error',
         '15': "Can't be judged",
         '20': 'In queue',
@@ -178,16 +1052,16 @@ class UvaSession(SessionAPI):
 
     def __init__(self):
         super().__init__()
-        self.uva_session = requests.session()
+        self.uva_session = self.new_session()
 
+    @tracing.traced
     def login(self, username, password):
         """
         logs the user in and returns a bool value
         stores the username in self.username.
         """
         get_response = self.uva_session.get(UvaSession.UVA_HOST)
-        login_text = lxml.html.fromstring(get_response.text)
-        hidden_inputs = login_text.xpath(r'//form//input[@type="hidden"]')
+        hidden_inputs = Parser.select(Parser.page(get_response.text), 'form input[type="hidden"]')
         # print hidden_inputs
         form = {x.attrib["name"]: x.attrib["value"] for x in hidden_inputs if x.attrib['name'] not in ["cx", "ie"]}
         form["username"] = username
@@ -200,6 +1074,8 @@ class UvaSession(SessionAPI):
         if (self.logged_in): self.username = username
         return self.logged_in
 
+    @tracing.traced
+    @renews_session
     def submit(self, probNum, path=pathlib.Path.cwd(), language=None):
         """
         submits the problem according to the problem Number of the question.
@@ -230,7 +1106,7 @@ class UvaSession(SessionAPI):
         updated_headers = {
             "Referer": UvaSession.UVA_HOST + "index.php?option=com_onlinejudge&Itemid=25",
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-            "Host": "uva.onlinejudge.org",
+            "Host": urlsplit(UvaSession.UVA_HOST).netloc,
             "Origin": UvaSession.UVA_HOST
         }
 
@@ -239,23 +1115,27 @@ class UvaSession(SessionAPI):
         print(submission_id)
         return self.check_result(submission_id, probNum)
 
+    @tracing.traced
     def check_result(self, submission_id, probNum):
         """
         checks the result of the latest submission and returns a list containing submission details.
         """
         username = self.username
         min_id = str(int(submission_id)-1)
-        judge_id = requests.get("http://uhunt.felix-halim.net/api/uname2uid/" + username).text
-        check = json.loads(requests.get('http://uhunt.felix-halim.net/api/subs-user/'+judge_id+'/'+min_id).text)
-        subs = check['subs']
+        judge_id = UvaSession.uhunt.uid(username)
+
+        def fetch():
+            check = json.loads(Transport.get(UhuntIndex.UHUNT_HOST + 'subs-user/' + judge_id + '/' + min_id).text)
+            # later submissions may be listed too; keep only this one
+            return [sub for sub in check['subs'] if str(sub[0]) == str(submission_id)]
+
+        subs, final = self.poller().poll(
+            fetch, lambda subs: bool(subs) and subs[0][2] not in UvaSession.PENDING_VERDICTS)
         translated_table = [
             ['Submission ID', 'Problem ID', 'Verdict ID', 'Runtime', 'Submission Time', 'Language', 'Rank']]
-        if not subs[0]:
+        if not subs:
             return None
         else:
-            while subs[0][2] == 0:
-                check = json.loads(requests.get('http://uhunt.felix-halim.net/api/subs-user/' + judge_id + '/' + min_id).text)
-                subs = check['subs']
             translated_row = list(map(str, subs[0]))
             print(translated_row)
             translated_row[1] = probNum
@@ -267,19 +1147,19 @@ class UvaSession(SessionAPI):
             translated_table.append(translated_row)
         return translated_table
 
+    @tracing.traced
     def display_sub(self):
         """
         returns the submission details of all the submissions made till date for the particular user.
         """
-        judge_id = requests.get("http://uhunt.felix-halim.net/api/uname2uid/" + self.username).text
-        check = json.loads(requests.get('http://uhunt.felix-halim.net/api/subs-user-last/' + judge_id + "/20").text)
+        judge_id = UvaSession.uhunt.uid(self.username)
+        check = json.loads(Transport.get(UhuntIndex.UHUNT_HOST + 'subs-user-last/' + judge_id + "/20").text)
         subs = check['subs'][::-1]
         translated_table = [
             ['Submission ID', 'Problem Number', 'Verdict ID', 'Runtime', 'Submission Time', 'Language', 'Rank']]
-        uhunt_num = 'http://uhunt.onlinejudge.org/api/p/id/'
         for row in subs:
             translated_row = list(map(str,row))
-            translated_row[1] = json.loads(requests.get(uhunt_num + translated_row[1]).text)['num']
+            translated_row[1] = UvaSession.uhunt.pid_to_num(translated_row[1])
             translated_row[2] = UvaSession.translator[translated_row[2]]
             translated_row[4] = datetime.datetime.fromtimestamp(int(translated_row[4])).strftime('%Y-%m-%d %H:%M:%S')
             translated_row[5] = UvaSession.translator[translated_row[5]]
@@ -288,6 +1168,7 @@ class UvaSession(SessionAPI):
             translated_table.append(translated_row)
         return translated_table
 
+    @tracing.traced
     def user_stats(self):
         """
             Returns a Dictionary containing
@@ -302,22 +1183,27 @@ class UvaSession(SessionAPI):
             'Last Submission',
             from My Statistics on the user-feed
             """
-        stat = "https://uva.onlinejudge.org/index.php?option=com_onlinejudge&Itemid=15"
-        account = "https://uva.onlinejudge.org/index.php?option=com_comprofiler&Itemid=3"
+        stat = UvaSession.UVA_HOST + "index.php?option=com_onlinejudge&Itemid=15"
+        account = UvaSession.UVA_HOST + "index.php?option=com_comprofiler&Itemid=3"
         stat_page = self.uva_session.get(stat)
-        stat_soup = bs(stat_page.text, 'lxml')
-        stat_table = stat_soup.find_all('table')
-        stats = stat_table[2].find('tr').find_all('td')
         acc = self.uva_session.get(account)
-        account_soup = bs(acc.text, 'lxml')
-        account_table = account_soup.find_all('table')
-        td = account_table[3].find_all('td')
-        data = {x.text: y.text for x, y in zip(td[0::2], td[1::2])}
+        return UvaSession.parse_user_stats(stat_page.text, acc.text)
+
+    @staticmethod
+    def parse_user_stats(stat_markup, account_markup):
+        """
+        :return: user_stats' dictionary, read from the statistics and the profile page
+        """
+        stat_table = Parser.select(Parser.page(stat_markup), 'table')
+        stats = Parser.select(Parser.first(stat_table[2], 'tr'), 'td')
+        account_table = Parser.select(Parser.page(account_markup), 'table')
+        td = Parser.select(account_table[3], 'td')
+        data = {Parser.text(x): Parser.text(y) for x, y in zip(td[0::2], td[1::2])}
 
         list_of_headings = ["submissions", "Tried", "Solved", "First Submission", "Last Submission"]
 
         for index, heading in enumerate(list_of_headings):
-            data[heading] = stats[index].text
+            data[heading] = Parser.text(stats[index])
 
         return data
 
@@ -326,12 +1212,9 @@ class UvaSession(SessionAPI):
         checks the status of the given question i.e. submission details of the particular question.
         returns a list of lists containing the details.
         """
-        judge_id = requests.get("http://uhunt.felix-halim.net/api/uname2uid/"+self.username).text
-        prob_json = json.loads(
-            requests.get(UvaSession.UHUNT_API + str(prob_Num)).text
-        )
-        pid = str(prob_json['pid'])
-        subs = json.loads(requests.get("http://uhunt.felix-halim.net/api/subs-pids/" + judge_id + "/" + pid).text)
+        judge_id = UvaSession.uhunt.uid(self.username)
+        pid = str(UvaSession.uhunt.num_to_pid(prob_Num))
+        subs = json.loads(Transport.get(UhuntIndex.UHUNT_HOST + "subs-pids/" + judge_id + "/" + pid).text)
         submission_table = subs[judge_id]['subs']
         translated_table = [['Submission ID', 'Problem Number', 'Verdict ID', 'Runtime', 'Submission Time', 'Language', 'Rank']]
         for row in submission_table:
@@ -346,27 +1229,125 @@ class UvaSession(SessionAPI):
         return translated_table
 
     @staticmethod
+    @tracing.traced
     def get_question(prob_Num):
         """
         gets the problem number of the question and returns the question link.
         """
-        prob_json = json.loads(
-            requests.get(UvaSession.UHUNT_API + str(prob_Num)).text
-        )
-        url = r"https://uva.onlinejudge.org/index.php?option=com_onlinejudge&Itemid=8&page=show_problem&problem=" + str(
-            prob_json["pid"])
+        url = UvaSession.UVA_HOST + "index.php?option=com_onlinejudge&Itemid=8&page=show_problem&problem=" + str(
+            UvaSession.uhunt.num_to_pid(prob_Num))
 
-        html = requests.get(url).text
-        soup = bs(html, 'lxml')
-        url = soup.find_all('td', attrs={'align': 'right'})[0].find_all('a')[-1]['href']
+        html = Transport.get(url).text
+        url = Parser.select(Parser.section(html, 'td[align="right"]'), 'a')[-1].get('href')
 
-        return "https://uva.onlinejudge.org/" + url
+        return UvaSession.UVA_HOST + url
+
+    @tracing.traced
+    def contest_problems(self, volume):
+        """
+        :return: problem numbers of the UVa volume
+        """
+        return [str(num) for num in UvaSession.uhunt.volume(volume)]
 
+    def session_expired(self, response):
+        location = response.headers.get('Location', '')
+        return super().session_expired(response) or 'task=login' in location or \
+            'You are not authorised' in response.text
+
+    @tracing.traced
+    def check_login(self):
+        """
+        The profile page is only shown to a logged in user
+        """
+        response = self.uva_session.get(UvaSession.UVA_HOST + "index.php?option=com_comprofiler&Itemid=3",
+                                        allow_redirects=False)
+        return not self.session_expired(response)
+
+    @tracing.traced
+    def fetch_samples(self, prob_Num):
+        """
+        UVa statements are PDFs, which cannot be scraped reliably for samples.
+        """
+        print("Samples cannot be extracted from UVa statements. Try ccli debug to use udebug inputs")
+        return []
+
+    @tracing.traced
     def logout(self):
         return True
 
+
+class ContestIndex:
+    """
+    Persisted CodeChef problem code -> contest code index.
+
+    The index is rebuilt at most once per TTL by querying every present contest concurrently;
+    between rebuilds, and across ccli invocations, resolving a problem's contest costs no requests.
+    A problem missing from the index may belong to a contest that started after the last build, so a
+    miss rebuilds it once, unless it was built within the last MISS_REBUILD_AFTER seconds. A problem
+    still missing afterwards, such as any practice problem, is recorded as in no contest until the
+    index expires, so looking it up again costs no requests either.
+    """
+    TTL = 6 * 60 * 60
+    MISS_REBUILD_AFTER = 5 * 60
+    WORKERS = 8
+
+    def __init__(self, name="codechef_contests.json"):
+        self.store = cache.JsonStore(name)
+        # held while the index is checked and rebuilt, so threads missing at once rebuild it only once
+        self.lock = threading.Lock()
+
+    def age(self):
+        return time.time() - self.store.data.get('built', 0)
+
+    def expired(self):
+        return self.age() > ContestIndex.TTL
+
+    def build(self, contest_names):
+        """
+        Fetches the problem list of every contest in parallel and replaces the index.
+        :param contest_names: contest codes to index
+        """
+        with ThreadPoolExecutor(max_workers=ContestIndex.WORKERS) as pool:
+            problem_lists = list(pool.map(context.carry(CodechefSession.ques_in_contest), contest_names))
+
+        problems = dict()
+        for contest_name, question_codes in zip(contest_names, problem_lists):
+            # a problem shared by several contests belongs to the last one listed
+            for question_code in question_codes:
+                problems[question_code] = contest_name
+
+        self.store.data['problems'] = problems
+        self.store.data['built'] = time.time()
+        self.store.save()
+
+    def contest(self, question_code, present_contests):
+        """
+        :param question_code: problem code
+        :param present_contests: callable returning the present contests, used when the index is stale
+        :return: code of the contest owning the problem, or None for practice problems
+        """
+        with self.lock:
+            if self.expired():
+                self.build([contest['contest_name'] for contest in present_contests()])
+            elif question_code not in self.store.data.get('problems', {}) and \
+                    self.age() > ContestIndex.MISS_REBUILD_AFTER:
+                self.build([contest['contest_name'] for contest in present_contests()])
+
+            problems = self.store.data.setdefault('problems', {})
+            if question_code not in problems:
+                problems[question_code] = None
+                self.store.save()
+            return problems[question_code]
+
+
 class CodechefSession(SessionAPI):
-    codechef_url = r"https://www.codechef.com"
+    website = 'codechef'
+    # "Input" or "Output" label, then the next code block. Up to 200 characters, tags such as the
+    # label's closing </h3> included, may separate them, as long as no other label or block comes between
+    SAMPLE_BLOCK = re.compile(r'(?is)\b(input|output)\b(?:(?!```|<pre|\binput\b|\boutput\b).){0,200}?'
+                              r'(?:```|<pre[^>]*>)(.*?)(?:```|</pre>)')
+    codechef_url = base_url('codechef', "https://www.codechef.com")
+    codechef_api = base_url('codechef_api', "https://api.codechef.com/")
 
     language_handler = {
         'cpp': '44',
@@ -405,23 +1386,22 @@ class CodechefSession(SessionAPI):
 
     }
 
+    contest_index = ContestIndex()
+
     def __init__(self):
         super().__init__()
-        self.codechef_session = requests.session()
+        self.codechef_session = self.new_session()
         self.username = ""
-        self.codechef_api = "https://api.codechef.com/"
         self.headers = None
 
 
+    @tracing.traced
     def login(self, username="", password=""):
 
         # logging in without credentials
         self.username = username
         response_page = self.codechef_session.get(CodechefSession.codechef_url)
-        html_page = lxml.html.fromstring(response_page.text)
-        hidden_inputs = html_page.xpath(
-            r'//form//input[@type="hidden"]'
-        )
+        hidden_inputs = Parser.select(Parser.page(response_page.text), 'form input[type="hidden"]')
         payload = {i.attrib["name"]: i.attrib["value"]
                    for i in hidden_inputs}
         payload['name'] = username
@@ -431,25 +1411,20 @@ class CodechefSession(SessionAPI):
 
         # removing extra sessions using simple scraping and form handling
         while response.url == CodechefSession.codechef_url + '/session/limit':
-            html_page = lxml.html.fromstring(response.text)
-            all_inputs = html_page.xpath(r'//form//input')
+            all_inputs = Parser.select(Parser.page(response.text), 'form input')
             payload = {i.attrib["name"]: i.attrib["value"] for i in all_inputs[::-1]}
 
             response = self.codechef_session.post(CodechefSession.codechef_url + '/session/limit', data=payload)
-        soup = bs(response.content, 'lxml')
-        name = soup.find(text=username)
+        name = Parser.page(response.content).xpath('//text()[. = $username]', username=username)
 
         self.logged_in = bool(name)
         if self.logged_in: self.username = username
         return self.logged_in
 
+    @tracing.traced
+    @renews_session
     def submit(self, question_code, path=pathlib.Path.cwd(), language=None):
-        contest = ""
-        for contests in self.info_present_contests():
-            for contest_ques in CodechefSession.ques_in_contest(contests['contest_name']):
-                if contest_ques == question_code:
-                    contest = '/' + contests['contest_name']
-                    break
+        contest = self.find_contest(question_code)
 
         file_path, file_name = path, path.name
         lang = CodechefSession.language_handler[language]
@@ -457,8 +1432,7 @@ class CodechefSession(SessionAPI):
             self.codechef_url + contest + '/submit/' + question_code
         )
 
-        html_page = lxml.html.fromstring(response.text)
-        hidden_inputs = html_page.xpath(r'//form//input[@type="hidden"]')
+        hidden_inputs = Parser.select(Parser.page(response.text), 'form input[type="hidden"]')
         payload = {i.attrib['name']: i.attrib['value'] for i in hidden_inputs}
         payload['language'] = lang
         payload['problem_code'] = question_code
@@ -476,9 +1450,16 @@ class CodechefSession(SessionAPI):
         sub_id = response.url.split('/')[-1]
         return sub_id , self.check_result(sub_id, question_code)
 
+    def find_contest(self, question_code):
+        """
+        :return: '/<contest code>' of the contest owning the problem, or "" for practice problems
+        """
+        contest_name = CodechefSession.contest_index.contest(question_code, self.info_present_contests)
+        return '' if contest_name is None else '/' + contest_name
+
     @staticmethod
     def ques_in_contest(contest_name):
-        response = requests.get(
+        response = Transport.get(
             CodechefSession.codechef_url + '/api/contests/' + contest_name
         )
 
@@ -489,6 +1470,7 @@ class CodechefSession(SessionAPI):
         ques_list = response['problems'].keys()
         return list(ques_list)
 
+    @tracing.traced
     def check_result(self, submission_id, question_code):
         """
         returns the result of a problem submission.
@@ -499,31 +1481,23 @@ class CodechefSession(SessionAPI):
         - Compilation error
         - Runtime Error
         """
-        table = None
-
         result = [['Sub-Task', 'Task', 'Score', "Result(time)"]]
         header = {
             'authority': CodechefSession.codechef_url,
             'User-Agent': 'Mozilla/5.0 (Linux; Android 6.0; Nexus 5 Build/MRA58N) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/60.0.3112.113 Mobile Safari/537.36'
         }
         # unwanted_results = ['compiling..', 'running..', 'waiting..', 'running judge..']
-        while table is None:
+        def fetch():
             response = self.codechef_session.get(CodechefSession.codechef_url +\
                                                  '/viewsolution/' +\
                                                  submission_id, headers=header)
+            return CodechefSession.parse_result(response.text)
 
-            try:
-                soup = bs(response.text, 'html5lib')
-                table = soup.find('table', attrs={'class', 'status-table'}).find_all('tr')
-            except:
-                pass
-
-        for tr in table[1:]:
-            rel = []
-
-            for td in tr.find_all('td'):
-                rel.append(td.get_text())
+        table, final = self.poller().poll(fetch, lambda table: table is not None)
+        if table is None:
+            return result
 
+        for rel in table:
             for k in range(4-len(rel)):
                 rel.append(' ')
             result.append(rel)
@@ -532,13 +1506,36 @@ class CodechefSession(SessionAPI):
         # balancing the tables
         return result
 
-    def logout(self, username):
+    @staticmethod
+    def parse_result(markup):
+        """
+        :return: cell texts of every row of the solution page's status table, or None until it is shown
+        """
+        table = Parser.section(markup, 'table.status-table', hint='status-table')
+        if table is None:
+            return None
+        return [[Parser.text(td) for td in Parser.select(tr, 'td')] for tr in Parser.select(table, 'tr')[1:]]
+
+    @staticmethod
+    def data_rows(markup):
+        """
+        :return: the cells of every body row of the page's first dataTable
+        """
+        table = Parser.section(markup, 'table.dataTable', hint='dataTable')
+        if table is None:
+            return []
+        rows = [Parser.select(tr, 'td') for tr in Parser.select(table, 'tr')]
+        return [cells for cells in rows if cells]
+
+    @tracing.traced
+    def logout(self):
         """
         logout
         :return: logout response
         """
         return self.codechef_session.get(CodechefSession.codechef_url + '/logout')
 
+    @tracing.traced
     def info_present_contests(self):
         """
         to check all present contests in codechef
@@ -546,32 +1543,75 @@ class CodechefSession(SessionAPI):
         """
         contests = []
         response = self.codechef_session.get(CodechefSession.codechef_url + '/contests')
-        soup = bs(response.content, 'html5lib')
-        table = soup.find_all('table', attrs={'class', 'dataTable'})[0]
-        for tr in table.find("tbody").find_all("tr"):
-            # for td in tr.find_all("td"):
-            #     print td.contents
-            contest_description = tr.find_all("td")
+        for contest_description in CodechefSession.data_rows(response.text):
             reg = {
-                'contest_name': contest_description[0].get_text(),
-                'contest_type': contest_description[1].get_text(),
-                'contest_date_start': contest_description[2].get_text(),
-                'contest_date_end': contest_description[3].get_text()
+                'contest_name': Parser.text(contest_description[0]),
+                'contest_type': Parser.text(contest_description[1]),
+                'contest_date_start': Parser.text(contest_description[2]),
+                'contest_date_end': Parser.text(contest_description[3])
             }
             contests.append(reg)
         return contests
 
+    @tracing.traced
     def get_question(self, question_code):
-        contest = ""
-        for contests in self.info_present_contests():
-            for contest_ques in CodechefSession.ques_in_contest(contests['contest_name']):
-                if contest_ques == question_code:
-                    contest = '/' + contests['contest_name']
-                    break
+        contest = self.find_contest(question_code)
 
         url = self.codechef_url + contest + '/problems/' + question_code
         return url
 
+    def contest_question(self, contest_id, question_code):
+        return self.codechef_url + '/' + contest_id + '/problems/' + question_code
+
+    def session_expired(self, response):
+        location = response.headers.get('Location', '')
+        return super().session_expired(response) or location.rstrip('/').endswith('/login')
+
+    @tracing.traced
+    def check_login(self):
+        """
+        The home page shows the username while logged in
+        """
+        response = self.codechef_session.get(CodechefSession.codechef_url)
+        return bool(Parser.page(response.content).xpath('//text()[. = $username]', username=self.username))
+
+    @tracing.traced
+    def contest_problems(self, contest_name):
+        """
+        :return: problem codes of the contest
+        """
+        return CodechefSession.ques_in_contest(contest_name)
+
+    @tracing.traced
+    def fetch_samples(self, question_code):
+        """
+        Reads the statement from CodeChef's problem API and pairs the code blocks that follow
+        "Input" and "Output" headings.
+        """
+        contest = self.find_contest(question_code) or '/PRACTICE'
+        response = Transport.get(self.codechef_url + '/api/contests' + contest + '/problems/' + question_code)
+        return CodechefSession.parse_samples(response.json().get('body', ''))
+
+    @staticmethod
+    def parse_samples(body):
+        """
+        :param body: statement from the problem API, in markdown or HTML
+        :return: [input, output] pairs of the statement's sample tests
+        """
+        blocks = CodechefSession.SAMPLE_BLOCK.findall(body)
+        inputs = [CodechefSession.block_text(text) for heading, text in blocks if heading.lower() == 'input']
+        outputs = [CodechefSession.block_text(text) for heading, text in blocks if heading.lower() == 'output']
+        return [list(sample) for sample in zip(inputs, outputs)]
+
+    @staticmethod
+    def block_text(text):
+        """
+        :return: contents of a code block, with any markup inside an HTML <pre> removed
+        """
+        text = html.unescape(re.sub(r'<[^>]*>', '', text))
+        return text.strip('\n') + '\n'
+
+    @tracing.traced
     def display_sub(self, prob_code="", contest_code="", year="", language="All"):
         """
         To get submission status... enter the above fields for filtering
@@ -589,36 +1629,40 @@ class CodechefSession(SessionAPI):
             'handle': self.username
         }
         response = self.codechef_session.get(self.codechef_url + '/submissions', params=param)
-        soup = bs(response.content, 'html5lib')
-        table = soup.find('table', attrs={'class', 'dataTable'})
         stats = [['ID', 'Date', 'Question', 'Contest', 'Status']]
-        for tr in table.find('tbody').findAll('tr'):
-            td = tr.find_all('td')
+        for td in CodechefSession.data_rows(response.text):
             stats.append(
                 [
-                    td[0].get_text(),
-                    td[1].get_text(),
-                    td[3].get_text(),
-                    td[4].get_text(),
-                    td[5].find('span')['title']
+                    Parser.text(td[0]),
+                    Parser.text(td[1]),
+                    Parser.text(td[3]),
+                    Parser.text(td[4]),
+                    Parser.first(td[5], 'span').get('title')
                 ]
             )
         return stats
 
+    @tracing.traced
     def user_stats(self, username):
-        response = requests.get(CodechefSession.codechef_url + '/users/' + self.username)
+        response = Transport.get(CodechefSession.codechef_url + '/users/' + self.username)
         # print(response.url)
-        soup = bs(response.content, 'html5lib')
-        name = soup.findAll('h2')[-1].get_text()
-        username = self.username
-        country = soup.find('span', attrs={'class', 'user-country-name'}).get_text()
-        codechef_rating = soup.find('div', attrs={'class', 'rating-number'}).get_text()
-        rank = soup.find('div', attrs={'class', 'rating-ranks'}).findAll('li')
-        global_rank = rank[0].get_text().split()[0]
-        country_rank = rank[1].get_text().split()[0]
-        solved = soup.find('h3', text="Problems Solved").parent.findAll('h5')
-        fully_solved = "".join(re.findall(r'\d+', solved[0].get_text()))
-        partially_solved = "".join(re.findall(r'\d+', solved[1].get_text()))
+        return CodechefSession.parse_user_stats(response.content, self.username)
+
+    @staticmethod
+    def parse_user_stats(markup, username):
+        """
+        :return: user_stats' dictionary, read from the user's profile page
+        """
+        page = Parser.page(markup)
+        name = Parser.text(Parser.select(page, 'h2')[-1])
+        country = Parser.text(Parser.first(page, 'span.user-country-name'))
+        codechef_rating = Parser.text(Parser.first(page, 'div.rating-number'))
+        rank = Parser.select(Parser.first(page, 'div.rating-ranks'), 'li')
+        global_rank = Parser.text(rank[0]).split()[0]
+        country_rank = Parser.text(rank[1]).split()[0]
+        solved = page.xpath('//h3[. = "Problems Solved"]/..//h5')
+        fully_solved = "".join(re.findall(r'\d+', Parser.text(solved[0])))
+        partially_solved = "".join(re.findall(r'\d+', Parser.text(solved[1])))
 
         return({
             'name': name,
@@ -639,7 +1683,7 @@ class CodechefSession(SessionAPI):
                 "redirect_uri":"{your_redirect_uri_without_bracket}"
                 }
 
-        resp = requests.post(self.codechef_api + "oauth/token", data=dat)
+        resp = Transport.post(self.codechef_api + "oauth/token", data=dat)
         the_data = resp.json()
         access_token = the_data['result']['data']['access_token']
         if str(resp.status_code) == '200':
@@ -649,14 +1693,15 @@ class CodechefSession(SessionAPI):
             return False
 
     def api_user_stats(self, username):
-         resp = requests.get(self.codechef_api + "/users/" + str(username),
+         resp = Transport.get(self.codechef_api + "/users/" + str(username),
                  headers=self.headers)
          return resp.json() 
 
 
 class CodeForce(SessionAPI):
-    FORCE_HOST = r"http://codeforces.com/"
-    FORCE_LOGIN = r"http://codeforces.com/enter?back=%2F"
+    website = 'codeforces'
+    FORCE_HOST = base_url('codeforces', "http://codeforces.com/")
+    FORCE_LOGIN = FORCE_HOST + "enter?back=%2F"
     language = {
         'GNU GCC 5.1.0': '10',
         'GNU GCC C11 5.10': '43',
@@ -709,8 +1754,9 @@ class CodeForce(SessionAPI):
 
     def __init__(self):
         super().__init__()
-        self.code_sess = requests.session()
+        self.code_sess = self.new_session()
 
+    @tracing.traced
     def login(self, username, password):
         """
         logs the user in.
@@ -722,57 +1768,85 @@ class CodeForce(SessionAPI):
         if login.status_code == 503:
             print("Server Down")
             return False
-        login = bs(login.text, "lxml")
-        login = login.find('form', id='linkEnterForm')
-        hidden = login.find_all('input')
+        login = Parser.section(login.text, 'form#linkEnterForm', hint='linkEnterForm')
+        hidden = Parser.select(login, 'input')
         form = {
-            'csrf_token': hidden[0]['value'],
+            'csrf_token': hidden[0].get('value'),
             'action': 'enter',
-            'ftaa': hidden[1]['value'],
-            'bfaa': hidden[2]['value'],
+            'ftaa': hidden[1].get('value'),
+            'bfaa': hidden[2].get('value'),
             'handle': username,
             'password': password,
             '_tta': ''
         }
         header = {
-            'Host': 'codeforces.com',
-            'Origin': 'http://codeforces.com',
+            'Host': urlsplit(CodeForce.FORCE_HOST).netloc,
+            'Origin': CodeForce.FORCE_HOST.rstrip('/'),
             'Referer': CodeForce.FORCE_LOGIN,
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
                           'Chrome/59.0.3071.115 Safari/537.36'
         }
         login_response = self.code_sess.post(CodeForce.FORCE_LOGIN, data=form, headers=header)
-        login_soup = bs(login_response.text, 'lxml')
-
-        try:
-            self.logged_in = username == login_soup.find('a', href='/profile/' + username).text
-        except AttributeError:
+        profile = Parser.section(login_response.text, 'a[href="/profile/{}"]'.format(username),
+                                 hint='/profile/' + username)
+        if profile is None:
             return False
+        self.logged_in = username == Parser.text(profile)
 
         if self.logged_in: self.username = username
         return self.logged_in
 
-    def check_result(self):
+    @tracing.traced
+    def check_result(self, question_id, previous_id):
         """
-        check result of the LATEST submission made
-        :return: the latest submission.
+        check result of the submission made after previous_id, matched by its submission id, so that
+        other submissions made meanwhile, from another job or window, are not reported instead
+        :param question_id: problem the submission was made to
+        :param previous_id: id of the user's latest submission before this one
+        :return: the submission.
         """
-        response = self.code_sess.get(CodeForce.FORCE_HOST + "submissions/" + self.username)
-        soup = bs(response.text, 'lxml')
         table_data = [["Submission Id", "When", "Who", "Problem", "Language", "Verdict", "Time", "Memory"]]
-        row = list()
-        trap = soup.find('span', class_='submissionVerdictWrapper').text.lower()
-        while 'running' in trap:
+
+        def fetch():
             page = self.code_sess.get(CodeForce.FORCE_HOST + "submissions/" + self.username)
-            soup = bs(page.text, 'lxml')
-            trap = soup.find('span', class_='submissionVerdictWrapper').text.lower()
-        table = soup.find_all('tr')
-        for element in table[26].find_all('td'):
-            row.append("".join(element.text.split()))
-        table_data.append(row)
+            rows = [row for row in CodeForce.parse_submissions(page.text)
+                    if row[0].isdigit() and int(row[0]) > previous_id]
+            # the earliest new submission to this problem; the problem cell starts with its code
+            rows = [row for row in rows if row[3].startswith(question_id)] or rows
+            return min(rows, key=lambda row: int(row[0])) if rows else None
+
+        def is_final(row):
+            if row is None:
+                return False
+            trap = row[5].lower()
+            return 'running' not in trap and 'queue' not in trap
+
+        row, final = self.poller().poll(fetch, is_final)
+        if row is not None:
+            table_data.append(row)
         return table_data
 
+    def latest_submission_id(self):
+        """
+        :return: id of the user's latest submission, 0 if there is none
+        """
+        page = self.code_sess.get(CodeForce.FORCE_HOST + "submissions/" + self.username)
+        ids = [int(row[0]) for row in CodeForce.parse_submissions(page.text) if row[0].isdigit()]
+        return max(ids, default=0)
+
+    @staticmethod
+    def parse_submissions(markup):
+        """
+        :return: rows of the submissions table on a status page, latest first, with whitespace removed
+        """
+        table = Parser.section(markup, 'table.status-frame-datatable', hint='status-frame-datatable')
+        if table is None:
+            return []
+        rows = [Parser.select(tr, 'td') for tr in Parser.select(table, 'tr')]
+        return [["".join(Parser.text(element).split()) for element in row] for row in rows if row]
 
+
+    @tracing.traced
     def logout(self):
         """
         finds the csrf_token for the logout link and signs out user
@@ -780,11 +1854,12 @@ class CodeForce(SessionAPI):
         :return: the logout link.
         """
         loginpage = self.code_sess.get(CodeForce.FORCE_HOST)
-        soup = bs(loginpage.text, "lxml")
-        csrf = soup.find('a', href='/profile/' + self.username)
-        logout_link = "http://codeforces.com" + csrf.find_next_sibling('a')['href']
+        csrf = Parser.first(Parser.page(loginpage.text), 'a[href="/profile/{}"]'.format(self.username))
+        logout_link = urljoin(CodeForce.FORCE_HOST, csrf.xpath('following-sibling::a[1]')[0].get('href'))
         return self.code_sess.get(logout_link)
 
+    @tracing.traced
+    @renews_session
     def submit(self, question_id, path, lang=None):
         """
         gets the language from the file extension or as user input and submits the file to the website.
@@ -794,9 +1869,8 @@ class CodeForce(SessionAPI):
         file_path, filename = path, path.name
         submit_link = CodeForce.FORCE_HOST + "problemset/submit"
         sub_request = self.code_sess.get(submit_link)
-        subsoup = bs(sub_request.text, 'lxml')
-        hidden = subsoup.find('form', class_='submit-form')
-        hidden = hidden.find_all('input')
+        hidden = Parser.section(sub_request.text, 'form.submit-form', hint='submit-form')
+        hidden = Parser.select(hidden, 'input')
 
         if lang is None:
             compiler = CodeForce.find_language(filename)
@@ -804,43 +1878,38 @@ class CodeForce(SessionAPI):
             compiler = CodeForce.language['lang']
 
         form = {
-            'csrf_token': hidden[0]['value'],
-            'ftaa': hidden[1]['value'],
-            'bfaa': hidden[2]['value'],
+            'csrf_token': hidden[0].get('value'),
+            'ftaa': hidden[1].get('value'),
+            'bfaa': hidden[2].get('value'),
             'action': 'submitSolutionFormSubmitted',
             'submittedProblemCode': question_id,
             'programTypeId': compiler,
             'source': '',
-            'tabsize': hidden[6]['value'],
+            'tabsize': hidden[6].get('value'),
             'sourceFile': open(file_path),
             '_tta': ''
         }
+        previous_id = self.latest_submission_id()
         response = self.code_sess.post(submit_link, data=form)
         if str(response.url) == CodeForce.FORCE_HOST + "problemset/status":
-            return self.check_result()
+            return self.check_result(question_id, previous_id)
         else:
-            soup = bs(response.text, "lxml")
-            errors = soup.find_all(class_="error")
+            errors = Parser.select(Parser.page(response.text), '.error')
             message = ''
             for i in errors:
-                message += i.text
+                message += Parser.text(i)
             print(message)
             return False
 
+    @tracing.traced
     def display_sub(self):
         """
         :return: list of lists containing the submission details
         """
         submit_link = CodeForce.FORCE_HOST + "submissions/" + self.username
         submit_page = self.code_sess.get(submit_link)
-        submit_soup = bs(submit_page.text, 'lxml')
-        table = submit_soup.find_all('tr')
         table_data = [["Submission Id", "When", "Who", "Problem", "Language", "Verdict", "Time", "Memory"]]
-        for row in range(26, len(table) - 1):
-            new_row = list()
-            for element in table[row].find_all('td'):
-                new_row.append("".join(element.text.split()))
-            table_data.append(new_row)
+        table_data.extend(CodeForce.parse_submissions(submit_page.text))
         return table_data
 
     def check_question_status(self, questionid):
@@ -856,22 +1925,71 @@ class CodeForce(SessionAPI):
         return data
 
     @staticmethod
+    @tracing.traced
     def get_question(questionid):
         """
         :return:  the question link.
         """
-        question_link = CodeForce.FORCE_HOST + "problemset/problem/" + questionid[:3] + "/" + questionid[3:]
+        contest_id, index = re.match(r'(\d+)(.*)', questionid).groups()
+        question_link = CodeForce.FORCE_HOST + "problemset/problem/" + contest_id + "/" + index
         return question_link
 
+    @tracing.traced
+    def contest_problems(self, contest_id):
+        """
+        :return: problem ids (contest id + index) of the contest
+        """
+        response = Transport.get(CodeForce.FORCE_HOST + "api/contest.standings",
+                                 params={'contestId': contest_id, 'from': 1, 'count': 1}).json()
+        if response['status'] != 'OK':
+            print(response.get('comment', "Contest not found"))
+            return []
+        return [str(problem['contestId']) + problem['index'] for problem in response['result']['problems']]
+
+    def session_expired(self, response):
+        return super().session_expired(response) or '/enter' in response.headers.get('Location', '')
+
+    @tracing.traced
+    def check_login(self):
+        """
+        The home page links to the user's profile while logged in
+        """
+        response = self.code_sess.get(CodeForce.FORCE_HOST)
+        profile = Parser.section(response.text, 'a[href="/profile/{}"]'.format(self.username),
+                                 hint='/profile/' + self.username)
+        return profile is not None
+
+    @tracing.traced
+    def fetch_samples(self, questionid):
+        """
+        Scrapes the sample tests from the problem page.
+        """
+        page = self.code_sess.get(CodeForce.get_question(questionid))
+        return CodeForce.parse_samples(page.text)
+
+    @staticmethod
+    def parse_samples(markup):
+        """
+        :return: [input, output] pairs of the problem page's sample tests
+        """
+        def text(pre):
+            lines = [line.strip() for line in '\n'.join(pre.itertext()).split('\n')]
+            return '\n'.join(line for line in lines if line) + '\n'
+
+        samples = []
+        for sample in Parser.select(Parser.page(markup), 'div.sample-test'):
+            inputs = [text(Parser.first(div, 'pre')) for div in Parser.select(sample, 'div.input')]
+            outputs = [text(Parser.first(div, 'pre')) for div in Parser.select(sample, 'div.output')]
+            samples.extend([list(pair) for pair in zip(inputs, outputs)])
+        return samples
+
+    @tracing.traced
     def user_stats(self):
         """
         :return: users personal details as a dictionary.
         """
         info_page = self.code_sess.get(CodeForce.FORCE_HOST + "profile/" + self.username)
-        info_soup = bs(info_page.text, 'lxml')
-        info_div = info_soup.find('div', class_='info')
-        user_rank = info_div.find('div', class_='user-rank').text.strip()
-        li = info_div.find_all('li')
+        user_info = CodeForce.parse_profile(info_page.text)
         table_data = self.display_sub()
         solved = 0
 
@@ -879,13 +1997,21 @@ class CodeForce(SessionAPI):
             if row[5] == 'Accepted':
                 solved += 1
 
-        user_info = {
-            'user_rank': user_rank,
-            'Contribution': li[0].span.text,
-            'Friend of': li[1].text.strip()[10:],
-            'Last-Visit': li[5].span.text.strip(),
-            'Registered': li[6].span.text.strip(),
-            'solved-questions': solved
-        }
+        user_info['solved-questions'] = solved
         return user_info
 
+    @staticmethod
+    def parse_profile(markup):
+        """
+        :return: rank, contribution, friends and visit dates from the info block of a profile page
+        """
+        info_div = Parser.section(markup, 'div.info')
+        li = Parser.select(info_div, 'li')
+        return {
+            'user_rank': Parser.text(Parser.first(info_div, 'div.user-rank')).strip(),
+            'Contribution': Parser.text(Parser.first(li[0], 'span')),
+            'Friend of': Parser.text(li[1]).strip()[10:],
+            'Last-Visit': Parser.text(Parser.first(li[5], 'span')).strip(),
+            'Registered': Parser.text(Parser.first(li[6], 'span')).strip()
+        }
+
@@ -1,15 +1,34 @@
+import asyncio
+import contextlib
 import json
 import os
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 import tornado.httpserver
 import tornado.ioloop
 import tornado.web
-from run_cpp import run_cpp
+import run_cpp
+from run_cpp import run_cpp_async
 from tornado.options import define, options
 import tornado.escape
 import tornado.wsgi
 
 define("port", default=8080, help="runs on the given port", type=int)
+define("workers", default=os.cpu_count() or 4, help="threads used for scraping and compiling", type=int)
+define("max_stream_size", default=1024 * 1024 * 1024, help="largest input accepted by /stream in bytes",
+       type=int)
+define("persist_solutions", default=True, help="keep scraped reference solutions on disk", type=bool)
+define("solution_ttl", default=run_cpp.SolutionCache.TTL, help="seconds a scraped reference solution is reused",
+       type=int)
+
+executor = None
+
+
+def get_executor():
+    global executor
+    if executor is None:
+        executor = ThreadPoolExecutor(max_workers=options.workers)
+    return executor
 
 
 class MyAppException(tornado.web.HTTPError):
@@ -40,7 +59,7 @@ class RunProgram(BaseHandler):
     async def get(self):
         user_input = self.get_argument("input")
         probNumber = self.get_argument("pno")
-        output = run_cpp(probNumber, user_input)
+        output = await run_cpp_async(probNumber, user_input, get_executor())
 
         self.write(json.dumps({
             'status_Code': 200,
@@ -48,6 +67,139 @@ class RunProgram(BaseHandler):
         }))
 
 
+class BatchRunProgram(BaseHandler):
+    """
+    Runs the reference solution of a problem over many inputs with a single scrape and compile.
+
+    The POST body is either JSON ({"pno": ..., "inputs": [...]} or a plain list of inputs),
+    NDJSON (one JSON string or {"input": ...} object per line) or a multipart upload with one
+    file per input. Results are streamed back as NDJSON lines as each input finishes, either
+    {"index": i, "result": output} or {"index": i, "error": message} if that input failed.
+    """
+
+    def parse_body(self):
+        """
+        :return: problem code given in the body (or None), list of inputs
+        """
+        content_type = self.request.headers.get('Content-Type', '')
+
+        try:
+            if content_type.startswith('multipart/form-data'):
+                return None, [upload['body'].decode('utf-8')
+                              for uploads in self.request.files.values() for upload in uploads]
+
+            body = self.request.body.decode('utf-8')
+            if 'ndjson' in content_type:
+                inputs = [json.loads(line) for line in body.splitlines() if line.strip()]
+                return None, [item['input'] if isinstance(item, dict) else item for item in inputs]
+
+            data = json.loads(body)
+        except (ValueError, KeyError, UnicodeDecodeError) as e:
+            raise MyAppException(400, reason="Malformed batch body: " + str(e))
+
+        probNumber = None
+        if isinstance(data, dict):
+            probNumber = data.get('pno')
+            data = data.get('inputs')
+        if not isinstance(data, list):
+            raise MyAppException(400, reason="Expected a list of inputs")
+        return probNumber, data
+
+    @staticmethod
+    def check_inputs(inputs):
+        """
+        Rejects the batch before any result is written, since errors after that cannot change the status
+        """
+        for index, user_input in enumerate(inputs):
+            if not isinstance(user_input, str):
+                raise MyAppException(400, reason="Input {} is not a string".format(index))
+
+    async def post(self):
+        probNumber, inputs = self.parse_body()
+        self.check_inputs(inputs)
+        probNumber = self.get_argument("pno", None) or probNumber
+        if probNumber is None:
+            raise MyAppException(400, reason="Missing argument pno")
+        parallel = self.get_argument("parallel", "true").lower() != "false"
+
+        program = await run_cpp.prepare_binary(probNumber, get_executor())
+
+        async def run(index, user_input):
+            try:
+                return {'index': index, 'result': await run_cpp.execute_async(program, user_input)}
+            except Exception as e:
+                # one failing input must not cut the stream short for the others
+                return {'index': index, 'error': "{}: {}".format(type(e).__name__, e)}
+
+        self.set_header('Content-Type', 'application/x-ndjson')
+        if parallel:
+            pending = asyncio.as_completed([run(index, user_input) for index, user_input in enumerate(inputs)])
+        else:
+            pending = (run(index, user_input) for index, user_input in enumerate(inputs))
+
+        for result in pending:
+            self.write(json.dumps(await result) + '\n')
+            await self.flush()
+
+
+@tornado.web.stream_request_body
+class StreamRunProgram(BaseHandler):
+    """
+    Runs the reference solution on an input streamed as the raw POST body.
+
+    The body is spooled to a file in the request's sandbox as it arrives, so a slow upload holds
+    no execution slot. Once it is complete the program runs on it, and its output is sent back in
+    chunks while it runs, so neither side is limited by URL length or held whole in memory.
+    """
+    CHUNK_SIZE = 64 * 1024
+
+    def initialize(self):
+        self.resources = None
+        self.running = False
+
+    async def prepare(self):
+        self.request.connection.set_max_body_size(options.max_stream_size)
+        probNumber = self.get_argument("pno")
+        self.program = await run_cpp.prepare_binary(probNumber, get_executor())
+
+        self.resources = contextlib.ExitStack()
+        self.sandbox = self.resources.enter_context(run_cpp.sandboxes.acquire())
+        self.input_path = self.sandbox / "stdin"
+        self.input = self.resources.enter_context(open(self.input_path, "wb"))
+
+    def data_received(self, chunk):
+        self.input.write(chunk)
+
+    async def post(self):
+        self.running = True
+        try:
+            self.input.close()
+            self.set_header('Content-Type', 'text/plain; charset=utf-8')
+            with open(self.input_path, 'rb') as stdin:
+                async with run_cpp.spawn(self.program, stdin, self.sandbox) as process:
+                    chunk = await process.stdout.read(StreamRunProgram.CHUNK_SIZE)
+                    while chunk:
+                        self.write(chunk)
+                        await self.flush()
+                        chunk = await process.stdout.read(StreamRunProgram.CHUNK_SIZE)
+                    await process.wait()
+        finally:
+            self.release()
+
+    def release(self):
+        if self.resources is not None:
+            self.resources.close()
+            self.resources = None
+
+    def on_finish(self):
+        self.release()
+
+    def on_connection_close(self):
+        # while the program runs, post() notices the closed connection and cleans up itself
+        if not self.running:
+            self.release()
+
+
 class TestHandler(BaseHandler):
     async def get(self):
         self.write(json.dumps({
@@ -59,6 +211,8 @@ class TestHandler(BaseHandler):
 app = tornado.web.Application(
     handlers=[
         (r"/", RunProgram),
+        (r"/batch", BatchRunProgram),
+        (r"/stream", StreamRunProgram),
         (r"/test", TestHandler)
     ]
 )
@@ -66,6 +220,7 @@ application = tornado.wsgi.WSGIAdapter(app)
 
 if __name__ == "__main__":
     options.parse_command_line()
+    run_cpp.solutions = run_cpp.SolutionCache(options.solution_ttl, options.persist_solutions)
     # http_server = tornado.httpserver.HTTPServer(app)
     app.listen(9090)
     # http_server.listen(os.environ.get("PORT", options.port))
@@ -0,0 +1,129 @@
+import contextlib
+import json
+import os
+import pathlib
+import threading
+import time
+
+CACHE_DIR = pathlib.Path.home() / "competitive-cli" / "cache"
+
+
+class JsonStore:
+    """
+    A dictionary persisted as a JSON file under ~/competitive-cli/cache.
+
+    The file is read lazily on first access and written atomically by save(),
+    so a crash or a concurrent ccli process never sees a half-written file.
+    """
+
+    def __init__(self, name):
+        self.path = CACHE_DIR / name
+        self.lock = threading.RLock()
+        self._data = None
+
+    @property
+    def data(self):
+        with self.lock:
+            if self._data is None:
+                try:
+                    with open(self.path) as store_file:
+                        self._data = json.load(store_file)
+                except (OSError, ValueError):
+                    self._data = dict()
+            return self._data
+
+    def save(self):
+        with self.lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.path.with_name("{}.{}.{}.tmp".format(self.path.name, os.getpid(),
+                                                                   threading.get_ident()))
+            with open(temp_path, 'w') as temp_file:
+                json.dump(self.data, temp_file)
+            os.replace(str(temp_path), str(self.path))
+
+    def clear(self):
+        with self.lock:
+            self._data = dict()
+            try:
+                os.remove(str(self.path))
+            except OSError:
+                pass
+
+
+class LRUDirectory:
+    """
+    A size-bounded directory of cached files, evicted least-recently-used first.
+
+    Recency is tracked through file modification times, which get() refreshes on every hit,
+    so the bound holds across processes sharing the directory.
+    """
+
+    STALE_TEMP = 60 * 60
+
+    def __init__(self, name, max_bytes, max_entries=None):
+        self.path = CACHE_DIR / name
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+
+    def get(self, key):
+        """
+        :return: path of the cached file, or None on a miss
+        """
+        entry = self.path / key
+        try:
+            os.utime(str(entry))
+        except OSError:
+            return None
+        return entry
+
+    def put(self, key, source):
+        """
+        Moves the file at source into the cache under key and evicts old entries.
+        :return: path of the cached file
+        """
+        self.path.mkdir(parents=True, exist_ok=True)
+        entry = self.path / key
+        os.replace(str(source), str(entry))
+        self.evict(keep=entry)
+        return entry
+
+    def evict(self, keep=None):
+        entries = []
+        for entry in self.path.iterdir():
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            if entry.suffix == '.tmp':
+                # still being written by write(), unless its writer died long ago
+                if time.time() - stat.st_mtime > LRUDirectory.STALE_TEMP:
+                    with contextlib.suppress(OSError):
+                        os.remove(str(entry))
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+
+        entries.sort()
+        total = sum(size for mtime, size, entry in entries)
+        count = len(entries)
+        for mtime, size, entry in entries:
+            if total <= self.max_bytes and (self.max_entries is None or count <= self.max_entries):
+                break
+            if entry == keep:
+                continue
+            try:
+                os.remove(str(entry))
+            except OSError:
+                continue
+            total -= size
+            count -= 1
+
+    def write(self, key, data):
+        """
+        Atomically stores the bytes under key and evicts old entries.
+        :return: path of the cached file
+        """
+        self.path.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path / "{}.{}.{}.tmp".format(key, os.getpid(), threading.get_ident())
+        with open(temp_path, 'wb') as temp_file:
+            temp_file.write(data)
+        return self.put(key, temp_path)
@@ -0,0 +1,31 @@
+"""
+State that belongs to one running command rather than to the process.
+
+The interactive shell runs commands as background jobs and the daemon serves several clients at
+once, so the judge session, the stream a command prints to and its trace are kept in context
+variables. A thread started by a pool begins with an empty context; work a command hands to a
+pool is wrapped with carry() so that it sees the command's context.
+"""
+import contextvars
+import functools
+
+
+def carry(function):
+    """
+    :return: function running in a copy of the caller's current context, whichever thread calls it
+    """
+    context = contextvars.copy_context()
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        # a context can only be entered by one thread at a time, so each call gets its own copy
+        return context.copy().run(function, *args, **kwargs)
+
+    return wrapper
+
+
+def isolated(function, *args, **kwargs):
+    """
+    Runs function in a copy of the current context, so the context variables it sets stay its own
+    """
+    return contextvars.copy_context().run(function, *args, **kwargs)
@@ -0,0 +1,427 @@
+"""
+Optional resident ccli process.
+
+`ccli daemon start` leaves a process running that keeps judge sessions, connection pools and
+caches warm. While it runs, CLI.main forwards every command to it over a Unix socket instead of
+importing and logging in again, and prints what the daemon streams back. Commands from several
+clients run at the same time, each on its own thread.
+
+Protocol: the client sends one JSON line, either {"argv": [...], "cwd": "..."} to run a command
+or {"control": "ping" | "stop"}. The daemon answers with JSON lines: {"out": text} and
+{"err": text} while the command runs, then a final {"exit": status}, {"pid": pid} or
+{"fallback": true} when the command needs a terminal and has to run in the client instead. A
+command that falls back has sent no output before, see Reply.
+"""
+import contextlib
+import json
+import os
+import pathlib
+import sys
+import threading
+import time
+
+SOCKET_PATH = pathlib.Path.home() / "competitive-cli" / "ccli.sock"
+IDLE_TIMEOUT = 60 * 60
+START_TIMEOUT = 10
+STOP_TIMEOUT = 10
+PING_TIMEOUT = 1
+
+
+def connect(timeout=None):
+    # imported here so commands run without a daemon do not pay for it
+    import socket
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    connection.settimeout(timeout)
+    try:
+        connection.connect(str(SOCKET_PATH))
+    except OSError:
+        connection.close()
+        raise
+    return connection
+
+
+def request(message, timeout=None):
+    """
+    Sends one message to the daemon.
+    :param timeout: seconds to wait for each reply, None to wait as long as the command runs
+    :return: iterator over the daemon's replies
+    """
+    connection = connect(timeout)
+    with connection, connection.makefile('rw', encoding='utf-8') as channel:
+        channel.write(json.dumps(message) + "\n")
+        channel.flush()
+        for line in channel:
+            yield json.loads(line)
+
+
+def ping():
+    """
+    :return: pid of the running daemon, or None
+    """
+    try:
+        for reply in request({"control": "ping"}, timeout=PING_TIMEOUT):
+            return reply.get("pid")
+    except (OSError, ValueError):
+        return None
+
+
+def forward(argv):
+    """
+    Runs the command in the daemon if one is running.
+    :return: the command's exit status, or None if it has to run in this process
+    """
+    if not SOCKET_PATH.exists():
+        return None
+    try:
+        replies = request({"argv": argv, "cwd": os.getcwd()})
+        reply = next(replies)
+    except (OSError, ValueError, StopIteration):
+        return None
+
+    try:
+        while True:
+            if "out" in reply:
+                sys.stdout.write(reply["out"])
+                sys.stdout.flush()
+            elif "err" in reply:
+                sys.stderr.write(reply["err"])
+                sys.stderr.flush()
+            elif reply.get("fallback"):
+                return None
+            elif "exit" in reply:
+                return reply["exit"]
+            reply = next(replies)
+    except (OSError, ValueError, StopIteration):
+        # the command may already have had effects, so it is not retried here
+        print("Lost connection to the ccli daemon")
+        return 1
+
+
+def start():
+    if ping() is not None:
+        print("Daemon already running")
+        return
+
+    import subprocess
+    SOCKET_PATH.parent.mkdir(parents=True, exist_ok=True)
+    subprocess.Popen([sys.executable, str(pathlib.Path(__file__).resolve()), "serve"],
+                     stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                     cwd=str(SOCKET_PATH.parent), start_new_session=True)
+
+    deadline = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < deadline:
+        pid = ping()
+        if pid is not None:
+            print("Daemon started (pid {})".format(pid))
+            return
+        time.sleep(0.05)
+    print("Daemon did not start")
+
+
+def stop():
+    try:
+        list(request({"control": "stop"}, timeout=STOP_TIMEOUT))
+    except (OSError, ValueError):
+        print("Daemon is not running")
+        return
+
+    # the daemon removes its socket once it has stopped accepting commands
+    deadline = time.monotonic() + STOP_TIMEOUT
+    while ping() is not None:
+        if time.monotonic() > deadline:
+            print("Daemon did not stop")
+            return
+        time.sleep(0.05)
+    print("Daemon stopped")
+
+
+def status():
+    pid = ping()
+    if pid is None:
+        print("Daemon is not running")
+    else:
+        print("Daemon running (pid {})".format(pid))
+
+
+class NeedsTerminal(Exception):
+    pass
+
+
+def no_prompt(*args, **kwargs):
+    """
+    Stands in for input() and getpass() while a command runs in the daemon. Prompts cannot be
+    answered there, so the command is sent back to the client before the prompt is shown.
+    """
+    raise NeedsTerminal()
+
+
+class NoInput:
+    """
+    Stands in for stdin while a command runs in the daemon, for reads that bypass input().
+    """
+
+    def readline(self, *args):
+        raise NeedsTerminal()
+
+    read = readline
+
+    def isatty(self):
+        return False
+
+    def fileno(self):
+        raise OSError("no terminal in the ccli daemon")
+
+
+class Reply:
+    """
+    Sends a running command's output to the client as {"out": text} and {"err": text} lines.
+
+    While the command's judge session is not logged in, it may still stop at a login prompt and
+    have to run in the client instead. Its output is held back until then, and dropped if the
+    command falls back, so that the client never prints it twice.
+    """
+
+    def __init__(self, channel):
+        self.channel = channel
+        self.held = []
+        self.closed = False
+        self.lock = threading.Lock()
+
+    def stream(self, name):
+        return ReplyStream(self, name)
+
+    def write(self, stream, text):
+        with self.lock:
+            if self.held is None:
+                self.send({stream: text})
+                return
+            self.held.append({stream: text})
+            if not may_prompt():
+                self.release()
+
+    def release(self):
+        held, self.held = self.held, None
+        for message in held:
+            self.send(message)
+
+    def finish(self, reply):
+        """
+        Sends the final reply, after the held output unless the command falls back
+        """
+        with self.lock:
+            if reply.get("fallback") and self.held is None:
+                # part of the output was shown, so running the command again in the client would repeat it
+                self.send({"err": "This command asked for input; stop the daemon to run it\n"})
+                reply = {"exit": 1}
+            elif reply.get("fallback"):
+                self.held = None
+            elif self.held is not None:
+                self.release()
+            self.send(reply)
+
+    def send(self, message):
+        if self.closed:
+            return
+        try:
+            self.channel.write(json.dumps(message) + "\n")
+            self.channel.flush()
+        except OSError:
+            # the client went away; let the command finish quietly
+            self.closed = True
+
+
+class ReplyStream:
+    """
+    File-like object passing what is written to it to the Reply as one of its streams
+    """
+
+    def __init__(self, reply, stream):
+        self.reply = reply
+        self.stream = stream
+
+    def write(self, text):
+        if text:
+            self.reply.write(self.stream, text)
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def isatty(self):
+        return False
+
+
+def may_prompt():
+    """
+    :return: whether the running command may still ask for a login
+    """
+    import CLI
+    website_object = CLI.current_session()
+    return website_object is None or not website_object.logged_in
+
+
+class Workspace:
+    """
+    What the commands running at once share: the process's working directory, the configuration
+    and the last logged in judge session.
+
+    Commands from the same directory run together; a command from another directory waits until
+    they have finished. The configuration is read when the first of them starts and written back
+    when the last one ends, so changes made by commands run without the daemon are picked up.
+    Every command starts with its own copy of the last session, which is dropped when the accounts
+    change, since it may belong to an account that was deleted or replaced.
+    """
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.cwd = None
+        self.commands = 0
+        self.config = None
+        self.accounts = None
+        self.session = None
+
+    @property
+    def busy(self):
+        return self.commands > 0
+
+    @contextlib.contextmanager
+    def enter(self, cwd):
+        import CLI
+        import CLI_helper
+
+        with self.condition:
+            while self.commands and self.cwd != cwd:
+                self.condition.wait()
+            if not self.commands:
+                os.chdir(cwd)
+                self.cwd = cwd
+                self.config = contextlib.ExitStack()
+                CLI.manager = self.config.enter_context(CLI_helper.PreferenceManager())
+                self.check_accounts(CLI.manager)
+            self.commands += 1
+            session = self.session
+        CLI.set_session(session.clone() if session is not None else None)
+
+        try:
+            yield
+        finally:
+            website_object = CLI.current_session()
+            with self.condition:
+                if website_object is not None and website_object.logged_in:
+                    self.session = website_object
+                self.check_accounts(CLI.manager)
+                self.commands -= 1
+                if not self.commands:
+                    self.config.close()
+                    CLI.manager = None
+                    self.condition.notify_all()
+
+    def check_accounts(self, manager):
+        accounts = (json.dumps(manager.data["accounts"], sort_keys=True), manager.account)
+        if accounts != self.accounts:
+            self.session = None
+            self.accounts = accounts
+
+
+def run(argv, cwd, reply, workspace):
+    """
+    Runs one command with its output sent to the client.
+    :return: the final reply
+    """
+    import traceback
+    import CLI
+
+    # this thread's output; sys.stdout and sys.stderr are JobOutputs while the daemon serves
+    sys.stdout.redirect(reply.stream("out"))
+    sys.stderr.redirect(reply.stream("err"))
+    with workspace.enter(cwd):
+        try:
+            CLI.parse(argv)
+            status = {"exit": 0}
+        except NeedsTerminal:
+            status = {"fallback": True}
+        except SystemExit as e:
+            status = {"exit": e.code if isinstance(e.code, int) else 1}
+        except Exception:
+            sys.stderr.write(traceback.format_exc())
+            status = {"exit": 1}
+        CLI.save_session()
+    return status
+
+
+def serve():
+    """
+    Serves commands, each on its own thread, until stopped or idle for IDLE_TIMEOUT seconds.
+    """
+    import builtins
+    import getpass
+    import socketserver
+    import CLI
+
+    # pay for the heavy imports once, before the first command
+    CLI.SessionAPI.Transport.shared()
+    CLI.prettytable.PrettyTable
+
+    # the daemon has no terminal: prompts send the command back to the client, and what a command
+    # prints goes to the client that sent it
+    sys.stdin = NoInput()
+    builtins.input = getpass.getpass = no_prompt
+    sys.stdout, sys.stderr = CLI.JobOutput(sys.stdout), CLI.JobOutput(sys.stderr)
+    workspace = Workspace()
+
+    class CommandHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            self.server.last_request = time.monotonic()
+            channel = self.connection.makefile('rw', encoding='utf-8')
+            with channel:
+                try:
+                    message = json.loads(channel.readline())
+                except ValueError:
+                    return
+                reply = Reply(channel)
+                control = message.get("control")
+                if control == "ping":
+                    status = {"pid": os.getpid()}
+                elif control == "stop":
+                    self.server.stop()
+                    status = {"exit": 0}
+                else:
+                    status = run(message["argv"], message["cwd"], reply, workspace)
+                reply.finish(status)
+            self.server.last_request = time.monotonic()
+
+    class CommandServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        last_request = time.monotonic()
+        stopping = False
+
+        def stop(self):
+            # shutdown() waits for serve_forever to return, so it cannot run on a thread serve_forever waits for
+            if not self.stopping:
+                self.stopping = True
+                threading.Thread(target=self.shutdown).start()
+
+        def service_actions(self):
+            # called by serve_forever between requests
+            if not workspace.busy and time.monotonic() - self.last_request > IDLE_TIMEOUT:
+                self.stop()
+
+    try:
+        SOCKET_PATH.unlink()
+    except OSError:
+        pass
+    # only the socket is private to the user; files commands create keep the user's umask
+    umask = os.umask(0o077)
+    try:
+        server = CommandServer(str(SOCKET_PATH), CommandHandler)
+    finally:
+        os.umask(umask)
+    # leaving the block waits for the commands still running
+    with server:
+        try:
+            server.serve_forever(poll_interval=1)
+        finally:
+            SOCKET_PATH.unlink()
+
+
+if __name__ == "__main__" and sys.argv[1:] == ["serve"]:
+    serve()
@@ -0,0 +1,54 @@
+import importlib
+import importlib.util
+import sys
+import threading
+import types
+
+_lock = threading.RLock()
+
+
+class LazyModule(types.ModuleType):
+    """
+    Stands in for a module until an attribute is first read from it, which imports the module.
+
+    The import runs under a lock, so threads reaching the module at the same moment, such as the
+    workers of a download pool or the interactive shell's background jobs, all see it fully loaded.
+    importlib.util.LazyLoader gives no such guarantee before Python 3.12.
+    """
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__['_module'] = None
+
+    def _load(self):
+        module = self.__dict__['_module']
+        if module is None:
+            with _lock:
+                module = self.__dict__['_module']
+                if module is None:
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__['_module'] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __dir__(self):
+        return dir(self._load())
+
+
+def lazy_import(name):
+    """
+    Returns the module without executing it; the real import happens on first attribute access.
+    Keeps heavy dependencies off the startup path of commands that never use them.
+    A missing module still raises ImportError immediately.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+
+    if importlib.util.find_spec(name) is None:
+        raise ImportError("No module named '{}'".format(name), name=name)
+    return LazyModule(name)
@@ -1,29 +1,267 @@
-from requests_html import HTMLSession
+import asyncio
+import atexit
+import hashlib
+import contextlib
+import itertools
 import json
+import os
+import queue
+import shutil
 from urllib.parse import unquote
-import uuid
 import subprocess
+import threading
+import time
 
+import cache
+from SessionAPI import CodechefSession, Parser, Transport
 
-def run_cpp(probNum, input):
-    subUrl = f"https://www.codechef.com/status/{probNum}?sort_by=Time&sorting_order=asc&language=44&status=15&handle="
-    with HTMLSession() as sess:
-        resp = sess.get(subUrl)
-        subID = resp.html.find("#primary-content > div > div.tablebox-section.l-float > table > tbody > "
-                               "tr:nth-child(1) > td:nth-child(1)", first=True).text
-
-        solUrl = f"https://www.codechef.com/viewsolution/{subID}"
-        solResp = sess.get(solUrl)
-        solution = solResp.html.find("#meta-info", first=True).text
-        obj = json.loads(solution)
-        code = unquote(obj['data']['plaintext'])
-        randomHash = str(uuid.uuid4().hex)
-        fileName = f"temp_code_{randomHash}.cpp"
+COMPILER = "g++"
+COMPILER_FLAGS = ["-std=c++14"]
+
+binaries = cache.LRUDirectory("binaries", max_bytes=256 * 1024 * 1024, max_entries=64)
+
+# Bounds how many programs run at once; created lazily inside the event loop.
+execution_slots = None
+
+
+class SandboxPool:
+    """
+    Pool of reusable scratch directories, one per in-flight compilation or run.
+
+    A sandbox is emptied when it is released and handed to the next caller, so concurrent
+    requests never share source files, binaries or files written by the program.
+    Sandboxes live next to the binary cache so compiled files can be moved into it.
+    """
+
+    def __init__(self, root=cache.CACHE_DIR / "sandboxes"):
+        self.root = root
+        self.free = queue.LifoQueue()
+        self.counter = itertools.count()
+        self.created = []
+        atexit.register(self.close)
+
+    @contextlib.contextmanager
+    def acquire(self):
+        try:
+            sandbox = self.free.get_nowait()
+        except queue.Empty:
+            sandbox = self.root / "{}_{}".format(os.getpid(), next(self.counter))
+            sandbox.mkdir(parents=True, exist_ok=True)
+            self.created.append(sandbox)
+
+        try:
+            yield sandbox
+        finally:
+            for entry in sandbox.iterdir():
+                if entry.is_dir():
+                    shutil.rmtree(str(entry), ignore_errors=True)
+                else:
+                    entry.unlink()
+            self.free.put(sandbox)
+
+    def close(self):
+        for sandbox in self.created:
+            shutil.rmtree(str(sandbox), ignore_errors=True)
+
+
+sandboxes = SandboxPool()
+
+
+def compile_cpp(code, flags=COMPILER_FLAGS):
+    """
+    Compiles the source, reusing a cached binary when the same source and flags were built before.
+    :return: path of the executable
+    """
+    key = hashlib.sha256("\0".join([COMPILER] + list(flags) + [code]).encode()).hexdigest()
+    binary = binaries.get(key)
+    if binary is not None:
+        return binary
+
+    with sandboxes.acquire() as sandbox:
+        fileName = sandbox / "temp_code.cpp"
+        binaryName = sandbox / "a.out"
         with open(fileName, "w") as temp:
             temp.write(code)
 
-        subprocess.call(["g++", fileName, "-std=c++14"])
-        run = subprocess.run(["./a.out"], stdout=subprocess.PIPE, input=input, encoding='ascii')
-        output = run.stdout
-        subprocess.call(["rm", fileName, 'a.out'])
-        return output
+        if subprocess.call([COMPILER, str(fileName), "-o", str(binaryName)] + list(flags)) != 0:
+            raise RuntimeError("Compilation failed")
+        return binaries.put(key, binaryName)
+
+
+class Program:
+    """
+    Source of a reference solution and its compiled binary in the shared cache.
+
+    Another process may evict the binary between compiling and running it, so callers that find
+    it missing when starting it call rebuild() and try once more.
+    """
+
+    def __init__(self, code, flags=COMPILER_FLAGS):
+        self.code = code
+        self.flags = flags
+        self.binary = compile_cpp(code, flags)
+
+    def rebuild(self):
+        self.binary = compile_cpp(self.code, self.flags)
+        return self.binary
+
+
+class SolutionCache:
+    """
+    TTL cache of the reference submission chosen for each problem code.
+
+    Entries hold the submission id and decoded source. They live in memory and, when persist
+    is set, in a JSON store too, so a restarted backend does not scrape CodeChef again.
+    """
+    TTL = 24 * 60 * 60
+
+    def __init__(self, ttl=TTL, persist=True):
+        self.ttl = ttl
+        self.store = cache.JsonStore("solutions.json") if persist else None
+        self.entries = self.store.data if persist else dict()
+        self.lock = threading.Lock()
+
+    def get(self, probNum):
+        """
+        :return: cached source code of the problem, or None if missing or expired
+        """
+        with self.lock:
+            entry = self.entries.get(probNum)
+        if entry is None or time.time() - entry['fetched'] > self.ttl:
+            return None
+        return entry['code']
+
+    def put(self, probNum, subID, code):
+        with self.lock:
+            self.entries[probNum] = {'submission': subID, 'code': code, 'fetched': time.time()}
+            if self.store is not None:
+                self.store.save()
+
+
+solutions = SolutionCache()
+
+
+def fetch_solution(probNum):
+    """
+    Returns the fastest accepted C++ solution of the problem, scraping CodeChef only on a cache miss.
+    :return: decoded source code
+    """
+    code = solutions.get(probNum)
+    if code is None:
+        subID, code = scrape_solution(probNum)
+        solutions.put(probNum, subID, code)
+    return code
+
+
+def scrape_solution(probNum):
+    """
+    Scrapes the fastest accepted C++ solution of the problem from CodeChef.
+    :return: submission id, decoded source code
+    """
+    subUrl = f"{CodechefSession.codechef_url}/status/{probNum}?sort_by=Time&sorting_order=asc&language=44&status=15&handle="
+    resp = Transport.get(subUrl)
+    subID = parse_first_submission(resp.text)
+
+    solUrl = f"{CodechefSession.codechef_url}/viewsolution/{subID}"
+    solResp = Transport.get(solUrl)
+    return subID, parse_solution(solResp.text)
+
+
+def parse_first_submission(markup):
+    """
+    :return: id of the first submission listed on a CodeChef status page
+    """
+    return Parser.text(Parser.first(Parser.page(markup),
+                                    "#primary-content > div > div.tablebox-section.l-float > table > tbody > "
+                                    "tr:nth-child(1) > td:nth-child(1)")).strip()
+
+
+def parse_solution(markup):
+    """
+    :return: decoded source code of a CodeChef solution page
+    """
+    solution = Parser.text(Parser.section(markup, "#meta-info", hint="meta-info"))
+    obj = json.loads(solution)
+    return unquote(obj['data']['plaintext'])
+
+
+def run_cpp(probNum, input):
+    program = Program(fetch_solution(probNum))
+    with sandboxes.acquire() as sandbox:
+        try:
+            run = subprocess.run([str(program.binary)], stdout=subprocess.PIPE, input=input, encoding='utf-8',
+                                 errors='replace', cwd=str(sandbox))
+        except FileNotFoundError:
+            run = subprocess.run([str(program.rebuild())], stdout=subprocess.PIPE, input=input, encoding='utf-8',
+                                 errors='replace', cwd=str(sandbox))
+    output = run.stdout
+    return output
+
+
+async def prepare_binary(probNum, executor=None):
+    """
+    Fetches and compiles the reference solution on the executor.
+    :return: Program
+    """
+    loop = asyncio.get_event_loop()
+    code = await loop.run_in_executor(executor, fetch_solution, probNum)
+    return await loop.run_in_executor(executor, Program, code)
+
+
+async def start_program(program, **kwargs):
+    """
+    Starts the program as an asyncio subprocess, compiling it again first if its binary was evicted
+    :return: process
+    """
+    try:
+        return await asyncio.create_subprocess_exec(str(program.binary), **kwargs)
+    except FileNotFoundError:
+        binary = await asyncio.get_event_loop().run_in_executor(None, program.rebuild)
+        return await asyncio.create_subprocess_exec(str(binary), **kwargs)
+
+
+def get_execution_slots():
+    global execution_slots
+    if execution_slots is None:
+        execution_slots = asyncio.Semaphore(os.cpu_count() or 4)
+    return execution_slots
+
+
+async def execute_async(program, input):
+    """
+    Runs the program on the input as an asyncio subprocess in its own sandbox.
+    :return: program output
+    """
+    async with get_execution_slots():
+        with sandboxes.acquire() as sandbox:
+            process = await start_program(program, stdin=asyncio.subprocess.PIPE,
+                                          stdout=asyncio.subprocess.PIPE, cwd=str(sandbox))
+            stdout, _ = await process.communicate(input.encode('utf-8'))
+    return stdout.decode('utf-8', errors='replace')
+
+
+@contextlib.asynccontextmanager
+async def spawn(program, stdin, sandbox):
+    """
+    Starts the program in the sandbox once an execution slot is free, reading from stdin (a file
+    or pipe) and writing to a pipe, so its output can be forwarded while it runs. The slot is held
+    only while the program runs, and the process is killed if still running on exit.
+    :return: process
+    """
+    async with get_execution_slots():
+        process = await start_program(program, stdin=stdin, stdout=asyncio.subprocess.PIPE, cwd=str(sandbox))
+        try:
+            yield process
+        finally:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+
+
+async def run_cpp_async(probNum, input, executor=None):
+    """
+    Same as run_cpp, without blocking the event loop: scraping and compilation run on the
+    executor and the program itself runs as an asyncio subprocess.
+    """
+    program = await prepare_binary(probNum, executor)
+    return await execute_async(program, input)
@@ -0,0 +1,169 @@
+import collections
+import os
+import pathlib
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# extension: (compile command or None, run command)
+# {source}, {binary}, {workdir} and {classname} are filled in per program
+LANGUAGES = {
+    '.cpp': (['g++', '-std=c++14', '-O2', '{source}', '-o', '{binary}'], ['{binary}']),
+    '.c': (['gcc', '-O2', '{source}', '-o', '{binary}', '-lm'], ['{binary}']),
+    '.py': (None, [sys.executable, '{source}']),
+    '.java': (['javac', '-d', '{workdir}', '{source}'], ['java', '-cp', '{workdir}', '{classname}']),
+    '.pas': (['fpc', '-o{binary}', '{source}'], ['{binary}']),
+    '.rb': (None, ['ruby', '{source}'])
+}
+
+Result = collections.namedtuple('Result', ['output', 'returncode', 'elapsed', 'timed_out'])
+# harness_error says why the generator or reference failed; it is None when the candidate is at fault
+Failure = collections.namedtuple('Failure', ['seed', 'input', 'expected', 'got', 'harness_error'])
+
+
+class Program:
+    """
+    A solution compiled once into its own temporary directory and then run on many inputs.
+
+    Use as a context manager so the build directory is removed afterwards.
+    """
+
+    def __init__(self, path, language=None):
+        """
+        :param path: source file
+        :param language: language name from SessionAPI.language_handler, inferred from the extension if None
+        """
+        self.path = pathlib.Path(path).resolve()
+        if language is None:
+            self.extension = self.path.suffix
+        else:
+            import SessionAPI
+            self.extension = SessionAPI.SessionAPI.language_handler.get(language)
+        self.workdir = pathlib.Path(tempfile.mkdtemp(prefix="ccli_"))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        shutil.rmtree(str(self.workdir), ignore_errors=True)
+
+    def _fill(self, command):
+        values = {
+            'source': str(self.path),
+            'binary': str(self.workdir / 'a.out'),
+            'workdir': str(self.workdir),
+            'classname': self.path.stem
+        }
+        return [part.format(**values) for part in command]
+
+    def compile(self):
+        """
+        :return: whether the program is ready to run; compiler errors are printed
+        """
+        if self.extension not in LANGUAGES:
+            print("Cannot run {} files locally".format(self.extension or self.path.name))
+            return False
+
+        compile_command = LANGUAGES[self.extension][0]
+        if compile_command is None:
+            return True
+        try:
+            build = subprocess.run(self._fill(compile_command), stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                   universal_newlines=True)
+        except FileNotFoundError:
+            print("Compiler {} is not installed".format(compile_command[0]))
+            return False
+        if build.returncode != 0:
+            print("Compilation failed")
+            print(build.stdout)
+            return False
+        return True
+
+    def command(self):
+        return self._fill(LANGUAGES[self.extension][1])
+
+    def run(self, input_data, timeout=None, args=()):
+        """
+        :return: Result with the program's output, exit code, wall time and whether it timed out
+        """
+        start = time.perf_counter()
+        try:
+            run = subprocess.run(self.command() + list(args), input=input_data, stdout=subprocess.PIPE,
+                                 stderr=subprocess.DEVNULL, universal_newlines=True, timeout=timeout)
+        except subprocess.TimeoutExpired as e:
+            output = e.output.decode(errors='replace') if isinstance(e.output, bytes) else e.output
+            return Result(output or '', None, time.perf_counter() - start, True)
+        return Result(run.stdout, run.returncode, time.perf_counter() - start, False)
+
+
+def default_workers():
+    return os.cpu_count() or 4
+
+
+def run_all(program, inputs, timeout=None, workers=None):
+    """
+    Runs the program on every input in parallel. Each run is its own OS process, so a thread
+    per run is enough to keep every core busy.
+    :return: list of Results in input order
+    """
+    with ThreadPoolExecutor(max_workers=workers or default_workers()) as pool:
+        return list(pool.map(lambda input_data: program.run(input_data, timeout), inputs))
+
+
+def failed(name, result):
+    """
+    :return: why the run failed, or None if it exited normally
+    """
+    if result.timed_out:
+        return "{} timed out".format(name)
+    if result.returncode != 0:
+        return "{} exited with code {}".format(name, result.returncode)
+    return None
+
+
+def check_case(generator, reference, candidate, seed, timeout=None):
+    """
+    Generates one input from the seed and runs both solutions on it.
+    :return: None if the outputs agree, else a Failure. If the generator or the reference failed,
+             the case says nothing about the candidate and the Failure carries a harness_error
+    """
+    case = generator.run('', timeout, args=[str(seed)])
+    error = failed("generator", case)
+    if error is not None:
+        return Failure(seed, case.output, '', '', error)
+    expected = reference.run(case.output, timeout)
+    error = failed("reference", expected)
+    if error is not None:
+        return Failure(seed, case.output, expected.output, '', error)
+
+    got = candidate.run(case.output, timeout)
+    if failed("candidate", got) is not None or expected.output.split() != got.output.split():
+        return Failure(seed, case.output, expected.output, got.output, None)
+    return None
+
+
+def stress(generator, reference, candidate, count=1000, timeout=10, workers=None):
+    """
+    Runs count generated cases across all cores, batch by batch, and stops after the first
+    batch with a failure. The generator receives the case's seed as its only argument.
+    :return: a harness error from that batch if there is one, else its smallest failing case, or None
+    """
+    workers = workers or default_workers()
+    batch = workers * 4
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for start in range(0, count, batch):
+            seeds = range(start, min(start + batch, count))
+            failures = [failure for failure in pool.map(
+                lambda seed: check_case(generator, reference, candidate, seed, timeout), seeds) if failure]
+            harness_errors = [failure for failure in failures if failure.harness_error is not None]
+            if harness_errors:
+                return harness_errors[0]
+            if failures:
+                return min(failures, key=lambda failure: len(failure.input))
+    return None
@@ -0,0 +1,210 @@
+"""
+Per-operation timing for a single ccli command.
+
+`ccli --trace <command>` starts a Tracer before the command is dispatched. While it is active,
+span() records a timed, nested span for every traced operation: the command itself, judge
+methods such as login and submit, each HTTP request sent through the shared transport, HTML
+parsing and table rendering. Afterwards the span tree is printed with per-phase timings and
+request counts, and can be written out as JSON with --trace=<path>.
+
+The tracer belongs to the context of the command that started it, so only that command's
+threads record spans: its own, and pool workers it hands work to with context.carry. Commands
+running alongside it, such as background jobs or other daemon clients, record nothing into it.
+Spans are nested per thread; spans opened on a thread with no open span, such as a worker of a
+thread pool, hang off the command's root span. Where no tracer is active span() returns a shared
+no-op context, so the instrumentation stays in place.
+"""
+import contextvars
+import functools
+import json
+import threading
+import time
+
+_active = contextvars.ContextVar('tracer', default=None)
+
+
+class Span:
+    def __init__(self, name, parent=None, **attrs):
+        self.name = name
+        self.parent = parent
+        self.attrs = attrs
+        self.children = []
+        self.thread = threading.current_thread().name
+        self.start = time.perf_counter()
+        self.end = None
+
+    @property
+    def duration(self):
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+    @property
+    def requests(self):
+        """
+        :return: number of HTTP requests sent inside this span, itself included
+        """
+        return (1 if self.name.startswith("http ") else 0) + sum(child.requests for child in self.children)
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def to_dict(self, origin):
+        return {
+            'name': self.name,
+            'start_ms': round((self.start - origin) * 1000, 3),
+            'duration_ms': round(self.duration * 1000, 3),
+            'requests': self.requests,
+            'thread': self.thread,
+            'attrs': self.attrs,
+            'children': [child.to_dict(origin) for child in self.children]
+        }
+
+
+class NoSpan:
+    """
+    Stands in for a span while nothing is traced.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+NO_SPAN = NoSpan()
+
+
+class Tracer:
+    def __init__(self, name):
+        self.root = Span(name)
+        self.token = None
+        self.local = threading.local()
+        self.lock = threading.Lock()
+
+    def open(self, name, attrs):
+        stack = self.stack()
+        parent = stack[-1] if stack else self.root
+        span = Span(name, parent, **attrs)
+        with self.lock:
+            parent.children.append(span)
+        stack.append(span)
+        return span
+
+    def close(self, span):
+        span.end = time.perf_counter()
+        stack = self.stack()
+        if stack and stack[-1] is span:
+            stack.pop()
+
+    def stack(self):
+        if not hasattr(self.local, 'stack'):
+            self.local.stack = []
+        return self.local.stack
+
+    def finish(self):
+        self.root.end = time.perf_counter()
+
+    def report(self):
+        """
+        :return: the span tree as text, one span per line. Runs of adjacent sibling leaves with the same
+                 name and status, such as the requests of a polling loop, are folded into one line
+        """
+        rows = []
+        self.report_span(self.root, 0, rows)
+        width = max(len(label) for label, duration, requests in rows)
+        lines = ["{:<{}} {:>10} {:>6}".format("span", width, "time", "reqs")]
+        for label, duration, requests in rows:
+            lines.append("{:<{}} {:>7.1f} ms {:>6}".format(label, width, duration * 1000, requests))
+        return "\n".join(lines)
+
+    def report_span(self, span, depth, rows, count=1, duration=None, requests=None):
+        label = "  " * depth + span.name + (" x{}".format(count) if count > 1 else "")
+        if 'status' in span.attrs:
+            label += " [{}]".format(span.attrs['status'])
+        rows.append((label, span.duration if duration is None else duration,
+                     span.requests if requests is None else requests))
+
+        groups = []
+        for child in span.children:
+            previous = groups[-1][-1] if groups else None
+            if previous is not None and not previous.children and not child.children and \
+                    (previous.name, previous.attrs.get('status')) == (child.name, child.attrs.get('status')):
+                groups[-1].append(child)
+            else:
+                groups.append([child])
+        for group in groups:
+            if len(group) == 1:
+                self.report_span(group[0], depth + 1, rows)
+            else:
+                self.report_span(group[0], depth + 1, rows, count=len(group),
+                                 duration=sum(child.duration for child in group),
+                                 requests=sum(child.requests for child in group))
+
+    def dump(self, path):
+        with open(path, 'w') as trace_file:
+            json.dump(self.root.to_dict(self.root.start), trace_file, indent=2)
+
+
+class ActiveSpan:
+    def __init__(self, tracer, name, attrs):
+        self.tracer = tracer
+        self.name = name
+        self.attrs = attrs
+        self.span = None
+
+    def __enter__(self):
+        self.span = self.tracer.open(self.name, self.attrs)
+        return self.span
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self.span.set(error=exc_type.__name__)
+        self.tracer.close(self.span)
+        return False
+
+
+def start(name):
+    """
+    Starts tracing a command in the current context.
+    :return: the Tracer
+    """
+    tracer = Tracer(name)
+    tracer.token = _active.set(tracer)
+    return tracer
+
+
+def stop(tracer):
+    """
+    Stops tracing; called in the context that started the tracer
+    """
+    tracer.finish()
+    _active.reset(tracer.token)
+
+
+def span(name, **attrs):
+    """
+    :return: context manager timing the block as a child of the current span; a no-op while nothing is traced
+    """
+    tracer = _active.get()
+    if tracer is None:
+        return NO_SPAN
+    return ActiveSpan(tracer, name, attrs)
+
+
+def traced(function):
+    """
+    Decorator recording every call of the function as a span named after its qualified name
+    """
+    name = function.__qualname__
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        if _active.get() is None:
+            return function(*args, **kwargs)
+        with span(name):
+            return function(*args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,95 @@
+"""
+Tests for cache.LRUDirectory, run with `python -m unittest discover tests`.
+"""
+import os
+import pathlib
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / "competitive-cli"))
+
+from cache import LRUDirectory  # noqa: E402
+
+
+class LRUDirectoryTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.now = time.time()
+
+        def cache(max_bytes, max_entries=None):
+            lru = LRUDirectory("test", max_bytes, max_entries)
+            lru.path = pathlib.Path(directory.name)
+            return lru
+
+        self.cache = cache
+
+    def add(self, lru, name, size, age):
+        """
+        Puts a file of size bytes in the cache directory, last used age seconds ago
+        """
+        path = lru.path / name
+        path.write_bytes(b"x" * size)
+        os.utime(str(path), (self.now - age, self.now - age))
+        return path
+
+    def names(self, lru):
+        return sorted(path.name for path in lru.path.iterdir())
+
+    def test_evicts_least_recently_used_over_max_bytes(self):
+        lru = self.cache(max_bytes=25)
+        self.add(lru, "a", 10, age=30)
+        self.add(lru, "b", 10, age=20)
+        self.add(lru, "c", 10, age=10)
+        lru.evict()
+        self.assertEqual(self.names(lru), ["b", "c"])
+
+    def test_evicts_over_max_entries(self):
+        lru = self.cache(max_bytes=1000, max_entries=1)
+        self.add(lru, "a", 1, age=20)
+        self.add(lru, "b", 1, age=10)
+        lru.evict()
+        self.assertEqual(self.names(lru), ["b"])
+
+    def test_get_refreshes_recency(self):
+        lru = self.cache(max_bytes=15)
+        self.add(lru, "a", 10, age=20)
+        self.add(lru, "b", 10, age=10)
+        self.assertIsNotNone(lru.get("a"))
+        lru.evict()
+        self.assertEqual(self.names(lru), ["a"])
+
+    def test_keeps_the_entry_just_added(self):
+        lru = self.cache(max_bytes=15)
+        self.add(lru, "a", 10, age=10)
+        keep = self.add(lru, "b", 20, age=20)
+        lru.evict(keep=keep)
+        self.assertEqual(self.names(lru), ["b"])
+
+    def test_temporary_files_are_not_evicted(self):
+        lru = self.cache(max_bytes=15)
+        self.add(lru, "a.1.2.tmp", 100, age=100)
+        self.add(lru, "b", 10, age=10)
+        lru.evict()
+        self.assertEqual(self.names(lru), ["a.1.2.tmp", "b"])
+
+    def test_stale_temporary_files_are_removed(self):
+        lru = self.cache(max_bytes=1000)
+        self.add(lru, "a.1.2.tmp", 10, age=LRUDirectory.STALE_TEMP + 60)
+        self.add(lru, "b.1.2.tmp", 10, age=60)
+        lru.evict()
+        self.assertEqual(self.names(lru), ["b.1.2.tmp"])
+
+    def test_write_and_get(self):
+        lru = self.cache(max_bytes=1000)
+        path = lru.write("key", b"data")
+        self.assertEqual(lru.get("key"), path)
+        self.assertEqual(path.read_bytes(), b"data")
+        self.assertIsNone(lru.get("missing"))
+        self.assertEqual(self.names(lru), ["key"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+"""
+Tests for SessionAPI.Parser.section, run with `python -m unittest discover tests`.
+"""
+import pathlib
+import sys
+import unittest
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / "competitive-cli"))
+
+from SessionAPI import Parser  # noqa: E402
+
+
+class SectionTest(unittest.TestCase):
+    def section(self, markup):
+        return Parser.section(markup, 'table.status-table', hint='status-table')
+
+    def test_hint_in_start_tag(self):
+        markup = '<html><body><table class="status-table"><tr><td>1</td></tr></table></body></html>'
+        self.assertEqual(Parser.text(self.section(markup)), "1")
+
+    def test_hint_first_appears_outside_the_element(self):
+        markup = ('<html><head><style>.status-table{}</style></head><body>'
+                  '<table class="nav"><tr><td>menu</td></tr></table>'
+                  '<table class="status-table"><tr><td>1</td></tr></table></body></html>')
+        self.assertEqual(Parser.text(self.section(markup)), "1")
+
+    def test_hint_in_an_earlier_element_of_the_same_tag(self):
+        markup = ('<html><body><table data-for="status-table"><tr><td>legend</td></tr></table>'
+                  '<table class="status-table"><tr><td>1</td></tr></table></body></html>')
+        self.assertEqual(Parser.text(self.section(markup)), "1")
+
+    def test_nested_tables(self):
+        markup = ('<html><body><table class="status-table"><tr><td><table><tr><td>inner</td></tr></table>'
+                  '</td><td>2</td></tr></table></body></html>')
+        element = self.section(markup)
+        self.assertEqual(element.get('class'), "status-table")
+        self.assertEqual(Parser.text(element), "inner2")
+
+    def test_hint_never_in_a_matching_element(self):
+        markup = '<html><head><style>.status-table{}</style></head><body><table></table></body></html>'
+        self.assertIsNone(self.section(markup))
+
+    def test_missing_hint(self):
+        self.assertIsNone(self.section('<html><body><table class="nav"></table></body></html>'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+"""
+Tests for reading the sample tests out of problem statements, run with `python -m unittest discover tests`.
+"""
+import pathlib
+import sys
+import unittest
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / "competitive-cli"))
+
+from SessionAPI import CodechefSession, CodeForce  # noqa: E402
+
+
+class CodechefSamplesTest(unittest.TestCase):
+    def test_markdown_blocks(self):
+        body = ("### Sample Input 1\n```\n2\n1 2\n```\n\n### Sample Output 1\n```\n3\n```\n"
+                "### Sample Input 2\n```\n1\n5 5\n```\n### Sample Output 2\n```\n10\n```\n")
+        self.assertEqual(CodechefSession.parse_samples(body), [["2\n1 2\n", "3\n"], ["1\n5 5\n", "10\n"]])
+
+    def test_tags_between_label_and_block(self):
+        body = ('<h3>Example Input</h3>\n<div class="sample"><pre>2\n1 2\n</pre></div>'
+                '<h3>Example Output</h3>\n<pre class="mathjax">3</pre>')
+        self.assertEqual(CodechefSession.parse_samples(body), [["2\n1 2\n", "3\n"]])
+
+    def test_markup_and_entities_inside_pre(self):
+        body = '<h3>Input</h3><pre><b>1</b> &lt; 2\n</pre><h3>Output</h3><pre>YES&amp;NO</pre>'
+        self.assertEqual(CodechefSession.parse_samples(body), [["1 < 2\n", "YES&NO\n"]])
+
+    def test_label_far_from_the_block(self):
+        body = "Input\n" + "x" * 300 + "\n```\n1\n```\nOutput\n```\n2\n```\n"
+        self.assertEqual(CodechefSession.parse_samples(body), [])
+
+    def test_prose_mention_is_not_a_label(self):
+        body = ("The input ends with a zero. Read the input carefully.\n"
+                "### Input\n```\n0\n```\n### Output\n```\nDONE\n```\n")
+        self.assertEqual(CodechefSession.parse_samples(body), [["0\n", "DONE\n"]])
+
+    def test_no_samples(self):
+        self.assertEqual(CodechefSession.parse_samples("Print the sum of the input."), [])
+
+
+class CodeforcesSamplesTest(unittest.TestCase):
+    def test_sample_tests(self):
+        markup = ('<html><body><div class="sample-test">'
+                  '<div class="input"><div class="title">Input</div><pre>2<br/>1 2\n</pre></div>'
+                  '<div class="output"><div class="title">Output</div><pre>3\n</pre></div>'
+                  '</div></body></html>')
+        self.assertEqual(CodeForce.parse_samples(markup), [["2\n1 2\n", "3\n"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
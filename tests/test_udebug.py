@@ -0,0 +1,78 @@
+"""
+Tests for udebug's output comparison, run with `python -m unittest discover tests`.
+"""
+import io
+import pathlib
+import sys
+import unittest
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / "competitive-cli"))
+
+from SessionAPI import udebug  # noqa: E402
+
+
+class LinesMatchTest(unittest.TestCase):
+    def test_line_endings_are_equal_in_exact_mode(self):
+        self.assertTrue(udebug.lines_match("1 2\r\n", "1 2\n"))
+        self.assertTrue(udebug.lines_match("1 2", "1 2\n"))
+
+    def test_whitespace_differs_in_exact_mode(self):
+        self.assertFalse(udebug.lines_match("1  2\n", "1 2\n"))
+        self.assertFalse(udebug.lines_match("1 2 \n", "1 2\n"))
+
+    def test_whitespace_mode_compares_tokens(self):
+        self.assertTrue(udebug.lines_match("1  2 \n", "1 2\n", 'whitespace'))
+        self.assertFalse(udebug.lines_match("1 3\n", "1 2\n", 'whitespace'))
+
+    def test_float_mode_within_tolerance(self):
+        self.assertTrue(udebug.lines_match("0.3333334\n", "0.333333\n", 'float'))
+        self.assertTrue(udebug.lines_match("1000000.5\n", "1000000\n", 'float'))
+        self.assertFalse(udebug.lines_match("0.3334\n", "0.3333\n", 'float'))
+
+    def test_float_mode_other_tokens(self):
+        self.assertTrue(udebug.lines_match("Case 1: 2.0\n", "Case 1: 2\n", 'float'))
+        self.assertFalse(udebug.lines_match("Case 2: 2\n", "Case 1: 2\n", 'float'))
+        self.assertFalse(udebug.lines_match("1 2\n", "1\n", 'float'))
+
+    def test_missing_line(self):
+        self.assertFalse(udebug.lines_match(None, "1\n"))
+        self.assertFalse(udebug.lines_match(None, "1\n", 'whitespace'))
+        self.assertTrue(udebug.lines_match(None, None))
+
+
+class CompareStreamsTest(unittest.TestCase):
+    def compare(self, user_output, accepted, mode='exact', max_mismatches=10):
+        return udebug.compare_streams(io.StringIO(user_output), io.StringIO(accepted), mode, max_mismatches)
+
+    def test_crlf_output_matches(self):
+        self.assertEqual(self.compare("1\r\n2\r\n", "1\n2\n"), [])
+
+    def test_missing_final_newline_matches(self):
+        self.assertEqual(self.compare("1\n2", "1\n2\n"), [])
+
+    def test_mismatches_without_line_endings(self):
+        self.assertEqual(self.compare("1\r\n3\r\n", "1\n2\n"), [(2, "3", "2")])
+
+    def test_extra_and_missing_lines(self):
+        self.assertEqual(self.compare("1\n", "1\n2\n"), [(2, None, "2")])
+        self.assertEqual(self.compare("1\n2\n", "1\n"), [(2, "2", None)])
+
+    def test_max_mismatches(self):
+        self.assertEqual(len(self.compare("1\n2\n3\n", "4\n5\n6\n", max_mismatches=2)), 2)
+
+    def test_whitespace_only_difference_is_described(self):
+        mismatches = self.compare("1 2 \n", "1 2\n")
+        self.assertEqual(mismatches, [(1, "1 2 ", "1 2")])
+        self.assertEqual(udebug.describe(mismatches[0]),
+                         "line 1: your output '1 2 ', accepted output '1 2' (whitespace differs)")
+
+    def test_whitespace_mode(self):
+        self.assertEqual(self.compare("1  2\n3\n", "1 2\n3\n", 'whitespace'), [])
+
+    def test_float_mode(self):
+        self.assertEqual(self.compare("0.5000001\n", "0.5\n", 'float'), [])
+        self.assertEqual(self.compare("0.51\n", "0.5\n", 'float'), [(1, "0.51", "0.5")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+"""
+Tests for SessionAPI.VerdictPoller, run with `python -m unittest discover tests`.
+"""
+import pathlib
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / "competitive-cli"))
+
+from SessionAPI import VerdictPoller  # noqa: E402
+
+
+class FakeClock:
+    """
+    Stands in for time.monotonic and time.sleep, so that waits take no time and are recorded
+    """
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class VerdictPollerTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patches = [mock.patch('time.monotonic', self.clock.monotonic), mock.patch('time.sleep', self.clock.sleep)]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def poll(self, states, **kwargs):
+        states = iter(states)
+        self.fetches = 0
+
+        def fetch():
+            self.fetches += 1
+            return next(states)
+
+        return VerdictPoller(**kwargs).poll(fetch, lambda state: state == "Accepted")
+
+    def test_final_verdict(self):
+        self.assertEqual(self.poll(["In queue", "Running", "Accepted"], jitter=0), ("Accepted", True))
+        self.assertEqual(self.fetches, 3)
+
+    def test_final_on_first_fetch_does_not_wait(self):
+        self.assertEqual(self.poll(["Accepted"]), ("Accepted", True))
+        self.assertEqual(self.clock.sleeps, [])
+
+    def test_deadline(self):
+        state, final = self.poll(iter(lambda: "Running", None), initial_delay=1, factor=2, jitter=0, deadline=10)
+        self.assertEqual((state, final), ("Running", False))
+        # 1 + 2 + 4 seconds, then only the 3 left until the deadline instead of 8
+        self.assertEqual(self.clock.sleeps, [1, 2, 4, 3])
+        self.assertEqual(self.fetches, 5)
+        self.assertEqual(self.clock.now, 10)
+
+    def test_final_at_the_deadline(self):
+        state, final = self.poll(["Running", "Accepted"], initial_delay=5, jitter=0, deadline=5)
+        self.assertEqual((state, final), ("Accepted", True))
+
+    def test_backoff_is_capped(self):
+        self.poll(iter(lambda: "Running", None), initial_delay=1, factor=10, max_delay=3, jitter=0, deadline=100)
+        self.assertEqual(set(self.clock.sleeps[1:-1]), {3})
+
+    def test_jitter_stays_within_bounds(self):
+        self.poll(["Running"] * 50 + ["Accepted"], initial_delay=1, factor=1, jitter=0.25)
+        self.assertTrue(all(0.75 <= seconds <= 1.25 for seconds in self.clock.sleeps))
+
+    def test_progress(self):
+        progress = []
+        VerdictPoller(initial_delay=1, factor=2, jitter=0, on_progress=lambda *args: progress.append(args)).poll(
+            iter(["Running", "Accepted"]).__next__, lambda state: state == "Accepted")
+        self.assertEqual(progress, [(1, 0.0, "Running"), (2, 1.0, "Accepted")])
+
+
+if __name__ == "__main__":
+    unittest.main()